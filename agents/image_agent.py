@@ -13,7 +13,7 @@ class ImageAgent:
     """Agent for processing medical images"""
     
     def __init__(self):
-        self.llm_service = LLMService()
+        self.llm_service = LLMService(priority="background", caller="image_agent")
     
     def process_document(self, document_path):
         """
@@ -4,6 +4,8 @@ Dynamic medical specialist agent based on user selection
 """
 
 from services.llm_service import LLMService
+from services.event_loop import get_event_loop_thread
+from services.conversation_memory import ConversationMemory
 from datetime import datetime
 
 class SpecialistAgent:
@@ -12,16 +14,38 @@ class SpecialistAgent:
     def __init__(self, specialist_type, user_data=None):
         self.specialist_type = specialist_type
         self.user_data = user_data or {}
-        self.llm_service = LLMService()
+        self.llm_service = LLMService(priority="consult", caller=f"specialist:{specialist_type}")
         self.conversation_history = []
+        
+        # Rolling summary + recent window used as prompt context
+        self.memory = ConversationMemory(
+            LLMService(priority="background", caller="memory")
+        )
     
-    def get_response(self, user_message, callback=None):
+    def get_response(self, user_message, callback=None, deadline=None):
         """
         Get a response from the specialist
         
         Args:
             user_message (str): User's message
             callback (function): Optional callback for streaming
+            deadline (Deadline): Optional deadline for the response
+            
+        Returns:
+            str: Specialist's response
+        """
+        return get_event_loop_thread().run(
+            self.get_response_async(user_message, callback, deadline)
+        )
+    
+    async def get_response_async(self, user_message, callback=None, deadline=None):
+        """
+        Get a response from the specialist without blocking a thread
+        
+        Args:
+            user_message (str): User's message
+            callback (function): Optional callback for streaming
+            deadline (Deadline): Optional deadline for the response
             
         Returns:
             str: Specialist's response
@@ -30,29 +54,35 @@ class SpecialistAgent:
         system_prompt = self._get_specialist_prompt()
         
         # Get response from LLM
-        response = self.llm_service.get_response(
+        response = await self.llm_service.get_response_async(
             system_prompt,
-            self.conversation_history,
+            self.memory.get_context(),
             user_message,
-            callback
+            callback,
+            deadline=deadline
         )
         
         # Add message to conversation history
         if user_message:
-            self.conversation_history.append({
+            self._add_to_history({
                 "role": "user",
                 "content": user_message
             })
         
         # Add response to conversation history
         if response:
-            self.conversation_history.append({
+            self._add_to_history({
                 "role": "assistant",
                 "content": response
             })
         
         return response
     
+    def _add_to_history(self, message):
+        """Record a message in the full history and the prompt memory"""
+        self.conversation_history.append(message)
+        self.memory.add(message)
+    
     def _get_specialist_prompt(self):
         """
         Generate a prompt for the specialist
@@ -12,7 +12,7 @@ class StructuredAgent:
     """Agent for processing structured data documents"""
     
     def __init__(self):
-        self.llm_service = LLMService()
+        self.llm_service = LLMService(priority="background", caller="structured_agent")
     
     def process_document(self, document_path):
         """
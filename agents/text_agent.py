@@ -12,7 +12,7 @@ class TextAgent:
     """Agent for processing text-based documents"""
     
     def __init__(self):
-        self.llm_service = LLMService()
+        self.llm_service = LLMService(priority="background", caller="text_agent")
     
     def process_document(self, document_path):
         """
@@ -140,7 +140,7 @@ Focus on facts and clinical details rather than interpretation.
 Format your response in a clear, structured way with headings and bullet points."""
         
         # For prototype, simulate analysis if LLM API is not configured
-        if not self.llm_service.api_key:
+        if not self.llm_service.is_configured():
             return self._simulate_analysis(text)
         
         # Get real analysis from LLM
@@ -39,6 +39,36 @@ AUDIO_SETTINGS = {
     "format": 8,  # For PyAudio.paInt16
     "silence_threshold": 300,
     "silence_duration": 1.0,  # seconds
+    "buffer_initial_seconds": 30,  # Capture buffer preallocated per recording
+    "buffer_max_seconds": 600,  # Buffer growth limit; past it the oldest audio is overwritten
+}
+
+# Long consultation recording settings
+LONG_RECORDING_SETTINGS = {
+    "window_seconds": 30,  # Audio transcribed per Whisper pass
+    "overlap_seconds": 5,  # Overlap between windows, so words at the edges are not cut
+    "poll_interval": 1.0,  # seconds between checks for a full window
+    "keep_audio": False,  # Keep the raw .pcm recording next to the transcript
+}
+
+# Voice activity detection settings
+VAD_SETTINGS = {
+    "frame_ms": 20,  # Analysis frame length
+    "speech_ratio": 3.0,  # Speech is this many times louder (RMS) than the noise floor
+    "min_threshold": AUDIO_SETTINGS["silence_threshold"],  # Lowest RMS level ever treated as speech
+    "initial_noise_floor": 100,  # RMS noise estimate before any audio is seen
+    "calibration_ms": 200,  # Opening audio used only to measure the noise floor
+    "calibration_percentile": 10,  # Floor is this percentile of the opening frames, so early speech is ignored
+    "max_calibrated_floor": 600,  # Calibration never sets a higher floor (the user may already be talking)
+    "noise_adapt_rate": 0.05,  # How quickly the noise floor follows background level
+    "noise_creep_rate": 0.002,  # How quickly the floor rises during sustained "speech" (absorbs steady noise)
+    "min_speech_frames": 3,  # Consecutive loud frames needed to start speech
+    "hangover_ms": AUDIO_SETTINGS["silence_duration"] * 1000,  # Quiet time after speech before it ends
+    "segment_pause_ms": 400,  # Shorter pause that closes a segment for partial transcription
+    "min_segment_ms": 500,  # Segments shorter than this are merged into the next
+    "max_segment_ms": 20000,  # Force a segment boundary in long unbroken speech
+    "no_speech_timeout_ms": 5000,  # Give up if nobody speaks for this long (0 waits forever)
+    "max_utterance_ms": 60000,  # End an utterance that has gone on this long (0 for no limit)
 }
 
 # Whisper model settings
@@ -46,20 +76,168 @@ WHISPER_SETTINGS = {
     "model_path": os.path.join(BASE_DIR, "models", "whisper"),
     "model_size": "base",
     "device": "cpu",  # "cuda" for GPU if available
+    "compute_type": "default",  # CTranslate2 compute type (e.g. "int8", "float32")
+    "idle_unload_timeout": 600,  # seconds unused before the model is unloaded (0 keeps it)
+    "transcribe_via_wav": False,  # Debug: transcribe from a temp WAV file instead of memory
+    "streaming_transcription": True,  # Transcribe segments while the user is still speaking
+    "cpu_threads": 0,  # CTranslate2 threads (0 uses its default)
+    "num_workers": 1,  # Transcriptions the model can run in parallel
+    "beam_size": 5,
+    "use_tuned_profile": True,  # Prefer the settings found by calibration (see below)
+    "profile_path": os.path.join(DATA_DIR, "whisper_profile.json"),
+}
+
+# Whisper auto-tuning: benchmark settings on reference clips, keep the fastest accurate one
+WHISPER_CALIBRATION_SETTINGS = {
+    "clips_dir": os.path.join(DATA_DIR, "whisper_calibration"),  # 16 kHz mono WAVs with matching .txt transcripts
+    "run_on_first_start": True,  # Calibrate in the background when no profile exists yet
+    "compute_types": ["int8", "int8_float32", "float32"],
+    "cpu_threads": [1, 2, 4, 8],  # Counts above the machine's cores are skipped
+    "beam_sizes": [1, 2, 5],
+    "wer_tolerance": 0.02,  # Allowed word error rate above the float32, beam 5 reference
+}
+
+# Shared transcription daemon (python -m services.transcription_daemon)
+TRANSCRIPTION_DAEMON_SETTINGS = {
+    "socket_path": None,  # e.g. "/tmp/guideai-whisper.sock"; None transcribes in-process
+    "workers": 0,  # Transcriptions run in parallel (0 = one per two CPU cores)
+    "socket_mode": 0o660,  # Permissions of the socket file
+    "timeout": 120,  # seconds a client waits for the daemon before giving up
+    "fallback_to_local": True,  # Load a model in-process if the daemon is unreachable
 }
 
 # LLM settings
 LLM_SETTINGS = {
+    "backend": "gemini",  # "gemini" or "stub" (offline, for benchmarking)
     "model": "gemini-2.0-flash-thinking-exp-01-21",  # Updated from "gemini-pro" to "gemini-1.0-pro"
     "api_key_file": os.path.join(BASE_DIR, "config", "api_keys.json"),
     "max_tokens": 1024,
     "temperature": 0.7,
+    "context_token_budget": 8000,  # Estimated prompt tokens (system + history + message)
+    "coalesce_requests": True,  # Share one API call between identical concurrent requests
+}
+
+# Offline stub LLM backend settings
+LLM_STUB_SETTINGS = {
+    "first_token_latency": 0.6,  # seconds before the first chunk
+    "tokens_per_second": 40,
+    "chunk_tokens": 4,  # tokens per streamed chunk
+    "response_template": "This is a simulated response to: {user_message}\n\n"
+                         "DISCLAIMER: This is not a substitute for professional medical advice.",
+    "canned_responses": {},  # Substring of the user message -> response text
+    # Fault injection (for exercising deadlines, hedging and the circuit breaker)
+    "error_rate": 0.0,  # Probability a request fails after the first-token delay
+    "stall_rate": 0.0,  # Probability a request stalls before its first chunk
+    "stall_seconds": 10.0,  # Extra first-token delay for stalled requests
+    "latency_jitter": 0.0,  # Random extra first-token delay, up to this many seconds
+    "seed": None,  # Random seed for reproducible faults
+}
+
+# LLM deadline, hedging and circuit breaker settings
+LLM_RESILIENCE_SETTINGS = {
+    "interactive_timeout": 60,  # seconds a UI action waits for a full response
+    "hedge_enabled": True,  # Race a duplicate interactive request when the first token is slow
+    "hedge_percentile": 95,  # Hedge after this percentile of upstream time to first chunk
+    "hedge_min_samples": 20,  # Samples needed before the percentile is trusted
+    "hedge_default_delay": 3.0,  # seconds before hedging until enough samples exist
+    "hedge_min_delay": 0.5,  # Never hedge sooner than this
+    "breaker_failure_threshold": 5,  # Consecutive failures that open the circuit
+    "breaker_reset_timeout": 30,  # seconds before a trial call is let through
+    "degraded_message": "The assistant is temporarily unavailable. Please try again in a moment. "
+                        "If this is a medical emergency, contact your local emergency services.",
+}
+
+# LLM record/replay settings
+LLM_CASSETTE_SETTINGS = {
+    "mode": None,  # None, "record" or "replay"
+    "path": os.path.join(DATA_DIR, "cassettes", "llm_session.json"),
+    "realtime": True,  # Replay with the recorded chunk timing
+    "strict": True,  # False: unmatched requests get the next recording in order
+}
+
+# LLM request scheduler settings
+LLM_SCHEDULER_SETTINGS = {
+    "requests_per_minute": 60,  # Sustained API request rate
+    "burst": 10,  # Requests that may start back to back
+    "classes": {
+        # Lower priority values are admitted first
+        "interactive": {"priority": 0, "max_concurrency": 4},  # Live chat turns
+        "consult": {"priority": 1, "max_concurrency": 2},  # Specialist consultations
+        "background": {"priority": 2, "max_concurrency": 1},  # Document analysis
+    },
+}
+
+# Conversation memory settings
+MEMORY_SETTINGS = {
+    "window_messages": 12,  # Recent messages kept verbatim in prompts
+    "compact_threshold": 4,  # Older messages that trigger a summary update
+}
+
+# LLM response cache settings
+LLM_CACHE_SETTINGS = {
+    "enabled": False,  # Opt-in: replay identical prompts from cache
+    "cache_dir": os.path.join(DATA_DIR, "llm_cache"),
+    "max_entries": 128,  # In-memory LRU size
+    "ttl": 24 * 60 * 60,  # seconds
+}
+
+# Performance metrics settings
+METRICS_SETTINGS = {
+    "max_samples": 1000,  # Recent samples kept per metric series
+    "dump_interval": 300,  # seconds between dumps (0 disables)
+    "dump_dir": os.path.join(DATA_DIR, "metrics"),
 }
 
 # Elevenlabs TTS settings
 TTS_SETTINGS = {
     "api_key_file": os.path.join(BASE_DIR, "config", "api_keys.json"),
     "voice_id": "EXAVITQu4vr4xnSDxMaL",  # Default voice
+    "model_id": "eleven_monolingual_v1",
+    "voice_settings": {
+        "stability": 0.5,
+        "similarity_boost": 0.5
+    },
+    "synthesis_concurrency": 2,  # Sentences synthesized ahead of playback at once
+    "min_sentence_chars": 20,  # Shorter sentences are spoken together with the next
+    "api_base_url": "https://api.elevenlabs.io/v1",
+    "request_timeout": 30,  # Seconds to wait for the API to start responding
+    "stream_chunk_size": 4096,  # Bytes handed to the player at a time
+    "streaming_playback": True,  # Play audio while it downloads instead of after
+    "barge_in": True,  # Pressing the mic stops the assistant talking
+    # Speaking over playback stops it too. Needs a headset or echo cancellation;
+    # on open speakers the assistant's own voice would interrupt it
+    "barge_in_on_speech": False,
+    # Players that decode MP3 from stdin, tried in order
+    "stream_players": [
+        ["mpg123", "-q", "-"],
+        ["ffplay", "-nodisp", "-autoexit", "-loglevel", "quiet", "-"],
+        ["mpv", "--no-video", "--really-quiet", "-"],
+    ],
+}
+
+# Synthesized speech cache settings
+TTS_CACHE_SETTINGS = {
+    "enabled": True,
+    "cache_dir": os.path.join(DATA_DIR, "tts_cache"),
+    "max_bytes": 200 * 1024 * 1024,  # Least recently used audio is evicted past this size
+}
+
+# Hands-free voice conversation settings
+VOICE_SETTINGS = {
+    # Listen while the reply plays, so talking over it interrupts. Needs a headset or
+    # echo cancellation (and TTS_SETTINGS["barge_in_on_speech"]); otherwise the
+    # assistant hears itself. False waits for the reply to finish before listening
+    "full_duplex": False,
+    "latency_budget_ms": 3000,  # Target from the user going quiet to hearing the reply
+    # Target time per stage, measured from the previous stage
+    "stage_budgets_ms": {
+        "end_detected": AUDIO_SETTINGS["silence_duration"] * 1000 + 100,
+        "transcribed": 400,
+        "first_token": 800,
+        "first_sentence": 600,
+        "audio_ready": 400,
+        "first_audio": 150,
+    },
 }
 
 # UI settings
@@ -71,6 +249,8 @@ UI_SETTINGS = {
     "font_family": "Arial",
     "header_font_size": 16,
     "normal_font_size": 11,
+    "stream_flush_interval": 0.033,  # seconds between streamed text updates (~30 fps)
+    "message_poll_ms": 33,  # How often the UI drains its message queue
 }
 
 # Get user directory path
@@ -6,9 +6,13 @@ Handles chat interactions with the LLM
 import os
 import json
 import datetime
-import threading
-from config.settings import get_user_dir
+import asyncio
+from config.settings import get_user_dir, LLM_RESILIENCE_SETTINGS
 from services.llm_service import LLMService
+from services.event_loop import get_event_loop_thread
+from services.conversation_memory import ConversationMemory
+from services.llm_resilience import Deadline
+from services.chunk_coalescer import ChunkCoalescer
 
 class ChatController:
     """Controller for chat interactions"""
@@ -17,11 +21,17 @@ class ChatController:
         self.user_data = user_data
         self.user_dir = get_user_dir(user_data["username"], user_data["user_type"])
         self.conversation_history = []
-        self.llm_service = LLMService()
+        self.llm_service = LLMService(priority="interactive", caller="chat")
         self.message_queue = None  # This will be set by the view
         
+        # Rolling summary + recent window used as prompt context
+        self.memory = ConversationMemory(
+            LLMService(priority="background", caller="memory")
+        )
+        
         # Load conversation history if available
         self.load_conversation_history()
+        self.memory.load(self.conversation_history)
     
     def set_message_queue(self, message_queue):
         """Set the message queue for UI updates"""
@@ -70,6 +80,7 @@ class ChatController:
         }
         
         self.conversation_history.append(message_entry)
+        self.memory.add(message_entry)
         
         # Save periodically (could be optimized to save less frequently)
         self.save_conversation_history()
@@ -129,7 +140,8 @@ The current date is {datetime.datetime.now().strftime("%Y-%m-%d")}."""
             callback (function): Optional callback for streaming response
             
         Returns:
-            str: LLM response
+            concurrent.futures.Future: Resolves to the LLM response once it has
+                been streamed and saved
         """
         # If no message queue is set, return
         if not self.message_queue:
@@ -139,32 +151,46 @@ The current date is {datetime.datetime.now().strftime("%Y-%m-%d")}."""
         # Add thinking message
         self.message_queue.put(("chat", "add_message", ("system", "Thinking...")))
         
-        # Run in a background thread to prevent UI blocking
-        def process_thread():
+        # The deadline starts with the user's action, not when the loop picks it up
+        deadline = Deadline(LLM_RESILIENCE_SETTINGS["interactive_timeout"])
+        
+        # Run on the shared event loop to prevent UI blocking
+        async def process_async():
             # Get system prompt
             system_prompt = self.get_system_prompt()
             
-            # Prepare a callback to update the UI
+            # Batch chunks into frame-sized UI updates instead of one per chunk
+            coalescer = ChunkCoalescer(
+                lambda text: self.message_queue.put(("chat", "add_response_chunk", text))
+            )
+            
             def ui_callback(chunk):
-                # Put the chunk into the message queue for UI update
-                self.message_queue.put(("chat", "add_response_chunk", chunk))
+                coalescer.add(chunk)
+                
+                # The caller's callback sees every chunk (e.g. for text-to-speech)
+                if callback:
+                    callback(chunk)
             
             # Get response from LLM
-            response = self.llm_service.get_response(
+            response = await self.llm_service.get_response_async(
                 system_prompt, 
-                self.conversation_history[-10:],  # Last 10 messages for context
+                self.memory.get_context(),  # Summary of older turns + recent messages
                 message,
-                ui_callback  # Use the UI-specific callback
+                ui_callback,  # Use the UI-specific callback
+                deadline=deadline
             )
             
-            # Add the full response to conversation history
-            self.add_message("assistant", response)
-        
-        # Start processing thread
-        threading.Thread(
-            target=process_thread,
-            daemon=True
-        ).start()
+            # Send the tail of the stream and close the message in the UI
+            coalescer.close()
+            self.message_queue.put(("chat", "end_response", None))
+            
+            # Add the full response to conversation history (file I/O off the loop)
+            await asyncio.to_thread(self.add_message, "assistant", response)
+            
+            return response
+        
+        # Schedule processing without dedicating a thread to it
+        return get_event_loop_thread().submit(process_async())
     
     def generate_summary(self):
         """Generate a summary of the conversation for the patient record"""
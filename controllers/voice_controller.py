@@ -0,0 +1,160 @@
+"""
+Voice Controller
+Hands-free voice conversation: listen, answer and speak, one turn after another
+"""
+
+import threading
+from config.settings import VOICE_SETTINGS
+from services.metrics import get_metrics_registry
+from services.voice_timeline import TurnTimeline, format_report
+from services.speech_service import TranscriptionError
+
+class VoiceController:
+    """Runs a pipelined voice conversation on top of the chat controller"""
+    
+    def __init__(self, chat_controller, speech_service, partial_callback=None, report_callback=None):
+        """
+        Initialize the controller
+        
+        Args:
+            chat_controller (ChatController): Produces and records the replies
+            speech_service (SpeechService): Listens and speaks
+            partial_callback (function): Optional callback for the transcript so far
+                (see SpeechService.record_and_transcribe)
+            report_callback (function): Optional callback receiving each turn's
+                latency report (see TurnTimeline.report)
+        """
+        self.chat_controller = chat_controller
+        self.speech_service = speech_service
+        self.partial_callback = partial_callback
+        self.report_callback = report_callback
+        self.metrics = get_metrics_registry()
+        
+        # Each run gets its own stop event, so a run still winding down never
+        # picks up a later start()
+        self._stopped = None
+        self._thread = None
+        
+        # The turn whose reply may still be synthesizing or playing
+        self._last_timeline = None
+    
+    @property
+    def running(self):
+        """Whether a conversation is in progress"""
+        return self._stopped is not None and not self._stopped.is_set()
+    
+    def start(self):
+        """
+        Start listening for the first turn
+        
+        Returns:
+            bool: False if the previous conversation is still finishing its turn
+        """
+        if self.running:
+            return True
+        
+        if self._thread and self._thread.is_alive():
+            return False
+        
+        stopped = threading.Event()
+        self._stopped = stopped
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(stopped,),
+            name="voice-conversation",
+            daemon=True
+        )
+        self._thread.start()
+        return True
+    
+    def stop(self):
+        """End the conversation, stopping any recording and speech"""
+        if self._stopped:
+            self._stopped.set()
+        self.speech_service.stop_recording()
+        self.speech_service.stop_speaking()
+        
+        if self._last_timeline:
+            self._last_timeline.finish()
+    
+    def _run(self, stopped):
+        """Take turns until stopped"""
+        while not stopped.is_set():
+            try:
+                self._run_turn(stopped)
+            except Exception as e:
+                print(f"Error in voice conversation: {str(e)}")
+                stopped.wait(1)
+    
+    def _run_turn(self, stopped):
+        """
+        Listen to one utterance and answer it
+        
+        Args:
+            stopped (threading.Event): Set when this run is stopped
+        """
+        timeline = TurnTimeline(on_complete=self._report_turn)
+        
+        # In full duplex, listening starts while the previous reply may still
+        # be playing and talking over it interrupts it
+        try:
+            transcript = self.speech_service.record_and_transcribe(
+                partial_callback=self.partial_callback,
+                interrupt_speech=False,
+                timeline=timeline
+            )
+        except TranscriptionError as e:
+            # Never send error text to the model; just listen again
+            print(f"Voice turn not transcribed: {str(e)}")
+            return
+        
+        # Nobody spoke (or only noise was heard): go back to listening
+        if stopped.is_set() or not transcript or not transcript.strip():
+            return
+        
+        # The previous reply has had its chance to start playing
+        if self._last_timeline:
+            self._last_timeline.finish()
+        self._last_timeline = timeline
+        
+        self.chat_controller.message_queue.put(("chat", "add_message", ("patient", transcript)))
+        self.chat_controller.add_message("patient", transcript)
+        
+        def on_chunk(chunk):
+            if stopped.is_set():
+                return
+            
+            timeline.mark("first_token")
+            
+            # Sentences are synthesized and played while the rest is generated
+            self.speech_service.speak_text(chunk, timeline)
+        
+        self.speech_service.begin_speaking()
+        future = self.chat_controller.process_message(transcript, callback=on_chunk)
+        
+        try:
+            future.result()
+        except Exception as e:
+            print(f"Error getting voice response: {str(e)}")
+        
+        self.speech_service.finish_speaking()
+        
+        # Half duplex: let the reply finish before listening again
+        if not VOICE_SETTINGS["full_duplex"]:
+            while not stopped.is_set() and self.speech_service.is_speaking:
+                stopped.wait(0.05)
+    
+    def _report_turn(self, report):
+        """Record a finished turn's latency against the budget"""
+        if report["mouth_to_ear_ms"] is not None:
+            self.metrics.observe("voice.mouth_to_ear", report["mouth_to_ear_ms"])
+        
+        for stage, duration in report["stages"].items():
+            self.metrics.observe("voice.stage_latency", duration, {"stage": stage})
+        
+        if report["over_budget"]:
+            self.metrics.observe("voice.over_budget", 1)
+            print(f"Voice turn over budget: {format_report(report)}")
+        
+        if self.report_callback:
+            self.report_callback(report)
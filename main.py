@@ -14,7 +14,8 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from views.auth_view import AuthView
 from controllers.auth_controller import AuthController
-from config.settings import initialize_app_directories
+from config.settings import initialize_app_directories, METRICS_SETTINGS
+from services.metrics import get_metrics_registry
 
 class GuideAI(tk.Tk):
     """Main application class for GuideAI"""
@@ -25,6 +26,13 @@ class GuideAI(tk.Tk):
         # Initialize application directories
         initialize_app_directories()
         
+        # Periodically dump performance metrics
+        if METRICS_SETTINGS["dump_interval"]:
+            get_metrics_registry().start_periodic_dump(
+                METRICS_SETTINGS["dump_interval"],
+                METRICS_SETTINGS["dump_dir"]
+            )
+        
         # Configure the main window
         self.title("GuideAI - Medical Assistant")
         self.geometry("1200x800")
@@ -0,0 +1,147 @@
+"""
+Audio Buffer
+Preallocated int16 buffer for captured audio, written from the PyAudio callback
+"""
+
+import threading
+import numpy as np
+
+
+class AudioBuffer:
+    """Growable buffer of int16 samples that becomes a ring buffer at its size limit"""
+
+    def __init__(self, initial_samples, max_samples=None):
+        """
+        Initialize the buffer
+
+        Args:
+            initial_samples (int): Samples preallocated up front
+            max_samples (int): Largest the buffer may grow; once full, the oldest
+                samples are overwritten (None grows without limit)
+        """
+        self.max_samples = max_samples
+        self._data = np.zeros(initial_samples, dtype=np.int16)
+        self._write_pos = 0
+        self._count = 0
+        self._total_written = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """Number of samples currently held"""
+        return self._count
+
+    @property
+    def total_written(self):
+        """Number of samples written since the last clear, including overwritten ones"""
+        return self._total_written
+
+    def clear(self):
+        """Forget all samples, keeping the allocated storage"""
+        with self._lock:
+            self._write_pos = 0
+            self._count = 0
+            self._total_written = 0
+
+    def write(self, data):
+        """
+        Append samples
+
+        Args:
+            data (bytes or numpy.ndarray): Raw int16 PCM bytes or int16 samples
+        """
+        samples = np.frombuffer(data, dtype=np.int16) if isinstance(data, (bytes, bytearray)) else data
+
+        with self._lock:
+            size = len(samples)
+            self._total_written += size
+
+            if self._write_pos + size > len(self._data):
+                self._grow(self._write_pos + size)
+
+            capacity = len(self._data)
+
+            # Only the newest capacity samples can be kept
+            if size > capacity:
+                samples = samples[-capacity:]
+                size = capacity
+
+            # A full ring continues from the start of the storage
+            position = self._write_pos % capacity
+
+            first = min(size, capacity - position)
+            self._data[position:position + first] = samples[:first]
+            if first < size:
+                self._data[:size - first] = samples[first:]
+                self._write_pos = size - first
+            else:
+                self._write_pos = position + size
+
+            self._count = min(self._count + size, capacity)
+
+    def latest(self, num_samples):
+        """
+        Get the most recent samples
+
+        Returns a view into the buffer unless the range wraps around the ring.
+
+        Args:
+            num_samples (int): Number of samples wanted
+
+        Returns:
+            numpy.ndarray: Up to num_samples int16 samples, oldest first
+        """
+        with self._lock:
+            return self._latest(num_samples)
+
+    def segment(self, start, end):
+        """
+        Get samples by their offsets since the last clear
+
+        Args:
+            start (int): Offset of the first sample
+            end (int): Offset just past the last sample
+
+        Returns:
+            numpy.ndarray: The samples still held in that range
+        """
+        with self._lock:
+            return self._latest(self._total_written - start)[:max(0, end - start)]
+
+    def view(self):
+        """
+        Get every held sample, oldest first
+
+        Returns:
+            numpy.ndarray: int16 samples (a view unless the ring has wrapped)
+        """
+        return self.latest(self._count)
+
+    def _latest(self, num_samples):
+        """Get the most recent samples (caller holds the lock)"""
+        num_samples = min(num_samples, self._count)
+        start = self._write_pos - num_samples
+
+        if start >= 0:
+            return self._data[start:self._write_pos]
+
+        return np.concatenate((self._data[start:], self._data[:self._write_pos]))
+
+    def _grow(self, needed):
+        """Enlarge the storage to hold at least needed samples, up to max_samples"""
+        capacity = len(self._data)
+
+        # A full ring that cannot grow keeps overwriting in place
+        if self.max_samples and capacity >= self.max_samples:
+            return
+
+        # Wrapped data cannot be extended in place
+        if self._count > self._write_pos:
+            return
+
+        new_capacity = max(needed, capacity * 2)
+        if self.max_samples:
+            new_capacity = min(new_capacity, self.max_samples)
+
+        data = np.zeros(new_capacity, dtype=np.int16)
+        data[:self._write_pos] = self._data[:self._write_pos]
+        self._data = data
@@ -0,0 +1,71 @@
+"""
+Chunk Coalescer
+Batches streamed text chunks into frame-sized UI updates
+"""
+
+import time
+import threading
+from config.settings import UI_SETTINGS
+from services.event_loop import get_event_loop_thread
+
+
+class ChunkCoalescer:
+    """Buffers chunks and flushes them at most once per interval"""
+
+    def __init__(self, flush_callback, interval=None):
+        """
+        Initialize the coalescer
+
+        Args:
+            flush_callback (function): Called with the joined text of each batch
+            interval (float): Minimum seconds between flushes
+        """
+        self.flush_callback = flush_callback
+        self.interval = interval if interval is not None else UI_SETTINGS["stream_flush_interval"]
+
+        self._buffer = []
+        self._last_flush = 0.0
+        self._scheduled = False
+        self._lock = threading.Lock()
+
+    def add(self, chunk):
+        """
+        Add a chunk, flushing now or scheduling a flush for the next frame
+
+        Args:
+            chunk (str): Streamed text chunk
+        """
+        if not chunk:
+            return
+
+        with self._lock:
+            self._buffer.append(chunk)
+
+            # A flush is already due; this chunk will go out with it
+            if self._scheduled:
+                return
+
+            delay = self.interval - (time.monotonic() - self._last_flush)
+            if delay > 0:
+                self._scheduled = True
+
+        if delay <= 0:
+            self.flush()
+        else:
+            loop = get_event_loop_thread().get_loop()
+            loop.call_soon_threadsafe(loop.call_later, delay, self.flush)
+
+    def flush(self):
+        """Send everything buffered so far"""
+        with self._lock:
+            text = "".join(self._buffer)
+            self._buffer.clear()
+            self._scheduled = False
+            self._last_flush = time.monotonic()
+
+        if text:
+            self.flush_callback(text)
+
+    def close(self):
+        """Flush any remaining text at the end of a stream"""
+        self.flush()
@@ -0,0 +1,134 @@
+"""
+Conversation Memory
+Rolling summary of older turns plus a verbatim window of recent ones
+"""
+
+import threading
+from config.settings import MEMORY_SETTINGS
+from services.event_loop import get_event_loop_thread
+
+SUMMARY_SYSTEM_PROMPT = """You are a medical summarization assistant.
+Maintain a running summary of a conversation between a user and a medical assistant.
+Keep symptoms, medical history, medications, allergies, advice given and open questions.
+Be concise and factual. Respond with the updated summary only."""
+
+
+class ConversationMemory:
+    """Keeps prompt context roughly constant in size as a conversation grows"""
+
+    def __init__(self, llm_service, window_messages=None, compact_threshold=None):
+        """
+        Initialize the conversation memory
+
+        Args:
+            llm_service (LLMService): Service used to generate summaries
+            window_messages (int): Number of recent messages kept verbatim
+            compact_threshold (int): Messages past the window before summarizing
+        """
+        self.llm_service = llm_service
+        self.window_messages = window_messages or MEMORY_SETTINGS["window_messages"]
+        self.compact_threshold = compact_threshold or MEMORY_SETTINGS["compact_threshold"]
+
+        self.summary = ""
+        self.messages = []
+        self._compacting = False
+        self._lock = threading.Lock()
+
+    def load(self, messages):
+        """
+        Seed the memory with an existing conversation
+
+        Args:
+            messages (list): Previous conversation messages
+        """
+        with self._lock:
+            self.messages = list(messages)
+
+        self._maybe_compact()
+
+    def add(self, message):
+        """
+        Add a message to the conversation
+
+        Args:
+            message (dict): Message with 'role' and 'content'
+        """
+        with self._lock:
+            self.messages.append(message)
+
+        self._maybe_compact()
+
+    def get_context(self):
+        """
+        Get the history to send with the next prompt
+
+        Returns:
+            list: Summary message (if any) followed by the verbatim messages
+        """
+        with self._lock:
+            context = []
+            if self.summary:
+                context.append({
+                    "role": "earlier conversation summary",
+                    "content": self.summary
+                })
+            context.extend(self.messages)
+            return context
+
+    def _maybe_compact(self):
+        """Start a background summary update if the window has overflowed"""
+        with self._lock:
+            overflow = len(self.messages) - self.window_messages
+
+            if self._compacting or overflow < self.compact_threshold:
+                return
+
+            self._compacting = True
+            to_summarize = self.messages[:overflow]
+            previous_summary = self.summary
+
+        get_event_loop_thread().submit(self._compact(previous_summary, to_summarize))
+
+    async def _compact(self, previous_summary, to_summarize):
+        """Fold the oldest messages into the running summary"""
+        try:
+            turns = "\n".join(
+                f"{msg.get('role', 'user').capitalize()}: {msg.get('content', '')}"
+                for msg in to_summarize
+            )
+
+            prompt = f"""Current summary:
+{previous_summary or "(none yet)"}
+
+New conversation turns:
+{turns}
+
+Update the summary to include the new turns."""
+
+            # Keep the messages verbatim if summarizing failed; degraded or
+            # cut-short text must never replace them
+            try:
+                new_summary = await self.llm_service.get_response_async(
+                    SUMMARY_SYSTEM_PROMPT,
+                    [],
+                    prompt,
+                    raise_on_failure=True
+                )
+            except Exception as e:
+                print(f"Conversation summary not updated: {str(e)}")
+                return
+
+            if not new_summary:
+                return
+
+            with self._lock:
+                self.summary = new_summary.strip()
+                # Only older messages are removed; newer ones were appended at the end
+                del self.messages[:len(to_summarize)]
+
+        finally:
+            with self._lock:
+                self._compacting = False
+
+        # More messages may have overflowed while we were summarizing
+        self._maybe_compact()
@@ -0,0 +1,97 @@
+"""
+Event Loop
+Shared asyncio event loop running on a background thread
+"""
+
+import asyncio
+import threading
+
+
+class EventLoopThread:
+    """Runs a single asyncio event loop on a daemon thread"""
+
+    def __init__(self, name="GuideAI-EventLoop"):
+        self.name = name
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def get_loop(self):
+        """
+        Get the event loop, starting its thread on first use
+
+        Returns:
+            asyncio.AbstractEventLoop: The running event loop
+        """
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                ready = threading.Event()
+                self._loop = asyncio.new_event_loop()
+
+                def run_loop():
+                    asyncio.set_event_loop(self._loop)
+                    self._loop.call_soon(ready.set)
+                    self._loop.run_forever()
+
+                self._thread = threading.Thread(
+                    target=run_loop,
+                    name=self.name,
+                    daemon=True
+                )
+                self._thread.start()
+                ready.wait()
+
+            return self._loop
+
+    def in_loop_thread(self):
+        """Check whether the caller is running on the event loop thread"""
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def submit(self, coro):
+        """
+        Schedule a coroutine on the event loop from any thread
+
+        Args:
+            coro (coroutine): Coroutine to run
+
+        Returns:
+            concurrent.futures.Future: Future for the coroutine's result
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.get_loop())
+
+    def run(self, coro, timeout=None):
+        """
+        Run a coroutine on the event loop and wait for its result
+
+        Args:
+            coro (coroutine): Coroutine to run
+            timeout (float): Optional maximum time to wait in seconds
+
+        Returns:
+            The coroutine's result
+        """
+        if self.in_loop_thread():
+            coro.close()
+            raise RuntimeError("Cannot block on the event loop from its own thread")
+
+        return self.submit(coro).result(timeout)
+
+
+_loop_thread = None
+_loop_thread_lock = threading.Lock()
+
+def get_event_loop_thread():
+    """
+    Get the process-wide event loop thread
+
+    Returns:
+        EventLoopThread: Shared event loop thread
+    """
+    global _loop_thread
+
+    if _loop_thread is None:
+        with _loop_thread_lock:
+            if _loop_thread is None:
+                _loop_thread = EventLoopThread()
+
+    return _loop_thread
@@ -0,0 +1,194 @@
+"""
+LLM Backends
+Interchangeable backends that turn a prompt into streamed text
+"""
+
+import re
+import random
+import asyncio
+from config.settings import LLM_STUB_SETTINGS
+
+# Splits text into word-sized tokens, keeping trailing whitespace attached
+_STUB_TOKEN_PATTERN = re.compile(r"\S+\s*|\s+")
+
+
+class LLMBackend:
+    """Base class for LLM backends"""
+
+    name = "base"
+
+    def is_configured(self):
+        """Check whether the backend is ready to serve requests"""
+        return True
+
+    async def stream(self, prompt, generation_config):
+        """
+        Stream a response for a prompt
+
+        Args:
+            prompt (str): Fully assembled prompt
+            generation_config (dict): Generation parameters
+
+        Yields:
+            str: Chunks of the response
+        """
+        raise NotImplementedError
+
+    async def generate(self, prompt, generation_config):
+        """
+        Generate a complete response for a prompt
+
+        Args:
+            prompt (str): Fully assembled prompt
+            generation_config (dict): Generation parameters
+
+        Returns:
+            str: The full response
+        """
+        chunks = []
+        async for chunk in self.stream(prompt, generation_config):
+            chunks.append(chunk)
+        return "".join(chunks)
+
+
+class GeminiBackend(LLMBackend):
+    """Backend for the Google Gemini API"""
+
+    name = "gemini"
+
+    def __init__(self, api_key, model_name):
+        """
+        Initialize the Gemini backend
+
+        Args:
+            api_key (str): Gemini API key
+            model_name (str): Name of the Gemini model
+        """
+        # Imported here so other backends work without google-generativeai installed
+        from services.model_registry import get_model_registry
+
+        self.api_key = api_key
+        self.model_name = model_name
+
+        # Shared registry of configured models (configures Gemini only once)
+        self.registry = get_model_registry()
+        self.registry.configure(self.api_key)
+
+    def is_configured(self):
+        """Check whether an API key is available"""
+        return bool(self.api_key)
+
+    async def stream(self, prompt, generation_config):
+        """Stream a response from the Gemini model"""
+        # Get a shared Gemini model from the registry
+        model = self.registry.get_model(self.model_name, generation_config)
+
+        response = await model.generate_content_async(prompt, stream=True)
+
+        async for chunk in response:
+            if hasattr(chunk, 'text') and chunk.text:
+                yield chunk.text
+
+
+class StubBackend(LLMBackend):
+    """Offline backend that streams canned text at a configurable pace"""
+
+    name = "stub"
+
+    def __init__(self, settings=None):
+        """
+        Initialize the stub backend
+
+        Args:
+            settings (dict): Overrides for LLM_STUB_SETTINGS
+        """
+        settings = dict(LLM_STUB_SETTINGS, **(settings or {}))
+
+        self.first_token_latency = settings["first_token_latency"]
+        self.tokens_per_second = settings["tokens_per_second"]
+        self.chunk_tokens = settings["chunk_tokens"]
+        self.response_template = settings["response_template"]
+        self.canned_responses = settings["canned_responses"]
+
+        # Fault injection for exercising deadlines, hedging and the circuit breaker
+        self.error_rate = settings["error_rate"]
+        self.stall_rate = settings["stall_rate"]
+        self.stall_seconds = settings["stall_seconds"]
+        self.latency_jitter = settings["latency_jitter"]
+        self._random = random.Random(settings["seed"])
+
+    async def stream(self, prompt, generation_config):
+        """Stream the stub response, pacing chunks like a real model"""
+        text = self._get_response_text(prompt)
+
+        tokens = _STUB_TOKEN_PATTERN.findall(text)
+        max_tokens = generation_config.get("max_output_tokens")
+        if max_tokens:
+            tokens = tokens[:max_tokens]
+
+        # Draw every fault up front so a seeded run is reproducible
+        fail = self._random.random() < self.error_rate
+        stall = self._random.random() < self.stall_rate
+        jitter = self._random.uniform(0, self.latency_jitter)
+
+        first_token_latency = self.first_token_latency + jitter
+        if stall:
+            first_token_latency += self.stall_seconds
+
+        await asyncio.sleep(first_token_latency)
+
+        if fail:
+            raise RuntimeError("Stub backend injected failure")
+
+        chunk_delay = self.chunk_tokens / self.tokens_per_second if self.tokens_per_second else 0
+
+        for start in range(0, len(tokens), self.chunk_tokens):
+            if start:
+                await asyncio.sleep(chunk_delay)
+            yield "".join(tokens[start:start + self.chunk_tokens])
+
+    def _get_response_text(self, prompt):
+        """Pick a canned response or fill in the response template"""
+        user_message = self._extract_user_message(prompt)
+
+        for trigger, response in self.canned_responses.items():
+            if trigger.lower() in user_message.lower():
+                return response
+
+        return self.response_template.format(
+            user_message=user_message,
+            prompt_chars=len(prompt)
+        )
+
+    def _extract_user_message(self, prompt):
+        """Get the current user message from an assembled prompt"""
+        start = prompt.rfind("User: ")
+        if start == -1:
+            return prompt.strip()
+
+        message = prompt[start + len("User: "):]
+        end = message.rfind("\nAssistant:")
+        if end != -1:
+            message = message[:end]
+
+        return message.strip()
+
+
+def create_backend(name, api_key=None, model_name=None):
+    """
+    Create an LLM backend by name
+
+    Args:
+        name (str): Backend name ("gemini" or "stub")
+        api_key (str): API key for backends that need one
+        model_name (str): Model name for backends that need one
+
+    Returns:
+        LLMBackend: The backend instance
+    """
+    if name == "gemini":
+        return GeminiBackend(api_key, model_name)
+    elif name == "stub":
+        return StubBackend()
+    else:
+        raise ValueError(f"Unknown LLM backend: {name}")
@@ -0,0 +1,241 @@
+"""
+LLM Cassette
+Records LLM traffic with chunk timing and replays it deterministically
+"""
+
+import os
+import json
+import time
+import asyncio
+import threading
+from config.settings import LLM_CASSETTE_SETTINGS
+from services.llm_backends import LLMBackend
+from services.response_cache import make_request_key
+
+
+class Cassette:
+    """A file of recorded LLM interactions"""
+
+    def __init__(self, path):
+        """
+        Initialize the cassette
+
+        Args:
+            path (str): Path to the cassette JSON file
+        """
+        self.path = path
+        self.interactions = []
+        self._used = set()
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Load recorded interactions from disk"""
+        with open(self.path, 'r') as f:
+            data = json.load(f)
+
+        with self._lock:
+            self.interactions = data.get("interactions", [])
+            self._used = set()
+
+    def record(self, interaction):
+        """
+        Add an interaction and save the cassette
+
+        Args:
+            interaction (dict): Recorded request, chunks and timing
+        """
+        with self._lock:
+            self.interactions.append(interaction)
+            data = {"version": 1, "interactions": list(self.interactions)}
+
+        self._save(data)
+
+    def next_match(self, key, strict=True):
+        """
+        Get the next recorded interaction for a request key
+
+        Repeated identical requests are replayed in the order they were recorded.
+
+        Args:
+            key (str): Request key
+            strict (bool): If False, fall back to the next unused interaction in
+                recording order when nothing matches (e.g. prompts containing dates)
+
+        Returns:
+            dict: Matching interaction, or None if none are left
+        """
+        with self._lock:
+            for index, interaction in enumerate(self.interactions):
+                if index not in self._used and interaction["key"] == key:
+                    self._used.add(index)
+                    return interaction
+
+            if not strict:
+                for index, interaction in enumerate(self.interactions):
+                    if index not in self._used:
+                        self._used.add(index)
+                        return interaction
+
+            return None
+
+    def _save(self, data):
+        """Write the cassette to disk atomically"""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+
+        with self._lock:
+            with open(temp_path, 'w') as f:
+                json.dump(data, f, indent=2)
+            os.replace(temp_path, self.path)
+
+
+def make_cassette_key(prompt, generation_config):
+    """Build the key used to match requests against a cassette"""
+    return make_request_key("cassette", generation_config, prompt)
+
+
+class RecordingBackend(LLMBackend):
+    """Backend wrapper that records every request to a cassette"""
+
+    def __init__(self, backend, cassette):
+        """
+        Initialize the recording backend
+
+        Args:
+            backend (LLMBackend): Backend that serves the requests
+            cassette (Cassette): Cassette to record into
+        """
+        self.backend = backend
+        self.cassette = cassette
+        self.name = backend.name
+
+    def is_configured(self):
+        """Check whether the wrapped backend is ready"""
+        return self.backend.is_configured()
+
+    async def stream(self, prompt, generation_config):
+        """Stream from the wrapped backend while recording chunk timing"""
+        started = time.monotonic()
+        chunks = []
+        error = None
+        aborted = False
+
+        try:
+            async for chunk in self.backend.stream(prompt, generation_config):
+                chunks.append([round(time.monotonic() - started, 4), chunk])
+                yield chunk
+
+        except (GeneratorExit, asyncio.CancelledError):
+            # Abandoned by the caller (e.g. a losing hedge); not a real response
+            aborted = True
+            raise
+
+        except Exception as e:
+            error = str(e)
+            raise
+
+        finally:
+            if not aborted:
+                self._record(prompt, generation_config, chunks, error, started)
+
+    def _record(self, prompt, generation_config, chunks, error, started):
+        """Save one finished interaction to the cassette"""
+        self.cassette.record({
+            "key": make_cassette_key(prompt, generation_config),
+            "prompt": prompt,
+            "generation_config": generation_config,
+            "chunks": chunks,
+            "error": error,
+            "duration": round(time.monotonic() - started, 4)
+        })
+
+
+class ReplayBackend(LLMBackend):
+    """Backend that serves requests from a cassette"""
+
+    name = "replay"
+
+    def __init__(self, cassette, realtime=True, strict=True):
+        """
+        Initialize the replay backend
+
+        Args:
+            cassette (Cassette): Cassette to replay from
+            realtime (bool): Reproduce recorded chunk timing (False replays instantly)
+            strict (bool): Only replay interactions whose prompt matches exactly
+        """
+        self.cassette = cassette
+        self.realtime = realtime
+        self.strict = strict
+
+    async def stream(self, prompt, generation_config):
+        """Replay the recorded chunks for a request"""
+        interaction = self.cassette.next_match(
+            make_cassette_key(prompt, generation_config),
+            strict=self.strict
+        )
+
+        if interaction is None:
+            raise LookupError("No recorded response in cassette for this request")
+
+        started = time.monotonic()
+
+        for offset, chunk in interaction["chunks"]:
+            if self.realtime:
+                delay = offset - (time.monotonic() - started)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            yield chunk
+
+        if interaction.get("error"):
+            raise RuntimeError(interaction["error"])
+
+
+_cassette = None
+_cassette_lock = threading.Lock()
+
+def get_cassette():
+    """
+    Get the process-wide cassette from LLM_CASSETTE_SETTINGS
+
+    Returns:
+        Cassette: Shared cassette instance
+    """
+    global _cassette
+
+    if _cassette is None:
+        with _cassette_lock:
+            if _cassette is None:
+                cassette = Cassette(LLM_CASSETTE_SETTINGS["path"])
+                if LLM_CASSETTE_SETTINGS["mode"] == "replay":
+                    cassette.load()
+                _cassette = cassette
+
+    return _cassette
+
+
+def apply_cassette(create_live_backend):
+    """
+    Choose a backend for recording or replay according to LLM_CASSETTE_SETTINGS
+
+    Args:
+        create_live_backend (function): Creates the backend that would normally
+            serve requests (not called in replay mode)
+
+    Returns:
+        LLMBackend: Backend to use
+    """
+    mode = LLM_CASSETTE_SETTINGS["mode"]
+
+    if mode == "replay":
+        return ReplayBackend(
+            get_cassette(),
+            realtime=LLM_CASSETTE_SETTINGS["realtime"],
+            strict=LLM_CASSETTE_SETTINGS["strict"]
+        )
+    elif mode == "record":
+        return RecordingBackend(create_live_backend(), get_cassette())
+    elif mode:
+        raise ValueError(f"Unknown cassette mode: {mode}")
+
+    return create_live_backend()
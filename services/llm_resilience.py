@@ -0,0 +1,250 @@
+"""
+LLM Resilience
+Deadlines, hedged requests and a circuit breaker for LLM calls
+"""
+
+import time
+import asyncio
+import threading
+from config.settings import LLM_RESILIENCE_SETTINGS
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a call runs past its deadline"""
+
+
+class CircuitOpenError(Exception):
+    """Raised when the circuit breaker is rejecting upstream calls"""
+
+
+class Deadline:
+    """Absolute point in time by which a call must finish"""
+
+    def __init__(self, timeout):
+        """
+        Initialize the deadline
+
+        Args:
+            timeout (float): Seconds from now until the deadline (None for no deadline)
+        """
+        self.expires_at = None if timeout is None else time.monotonic() + timeout
+
+    def remaining(self):
+        """
+        Get the time left before the deadline
+
+        Returns:
+            float: Seconds remaining (None if there is no deadline)
+        """
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self):
+        """Check whether the deadline has passed"""
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+
+
+async def iterate_with_deadline(chunks, deadline):
+    """
+    Iterate an async stream, giving up when a deadline passes
+
+    Args:
+        chunks: Async iterator of chunks
+        deadline (Deadline): Deadline for the whole stream (None for no limit)
+
+    Yields:
+        Chunks from the stream
+
+    Raises:
+        DeadlineExceeded: If the deadline passes before the stream finishes
+    """
+    iterator = chunks.__aiter__()
+
+    try:
+        while True:
+            remaining = deadline.remaining() if deadline else None
+
+            if remaining is not None and remaining <= 0:
+                raise DeadlineExceeded("Deadline exceeded")
+
+            try:
+                chunk = await asyncio.wait_for(iterator.__anext__(), remaining)
+            except StopAsyncIteration:
+                return
+            except asyncio.TimeoutError:
+                raise DeadlineExceeded("Deadline exceeded")
+
+            yield chunk
+
+    finally:
+        if hasattr(iterator, "aclose"):
+            await iterator.aclose()
+
+
+async def hedged_stream(create_stream, hedge_after, create_hedge=None):
+    """
+    Stream from a primary request, racing a duplicate if the first chunk is slow
+
+    Whichever request produces its first chunk first is used; the other is cancelled.
+
+    Args:
+        create_stream (function): Returns a new async iterator for the request
+        hedge_after (float): Seconds to wait for a first chunk before hedging
+        create_hedge (function): Returns the duplicate's async iterator, or None
+            to skip hedging (defaults to create_stream)
+
+    Yields:
+        Chunks from the winning request
+    """
+    attempts = []
+
+    def start_attempt(stream):
+        stream = stream.__aiter__()
+        first = asyncio.ensure_future(stream.__anext__())
+        attempts.append((stream, first))
+        return first
+
+    pending = {start_attempt(create_stream())}
+    done, pending = await asyncio.wait(pending, timeout=hedge_after)
+
+    if not done:
+        hedge = (create_hedge or create_stream)()
+        if hedge is not None:
+            pending.add(start_attempt(hedge))
+
+    winner = None
+    error = None
+
+    try:
+        while winner is None and (done or pending):
+            if not done:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+            for stream, first in attempts:
+                if first in done and winner is None:
+                    if first.exception() is None or isinstance(first.exception(), StopAsyncIteration):
+                        winner = (stream, first)
+                    else:
+                        error = first.exception()
+
+            done = set()
+
+        if winner is None:
+            raise error
+
+    finally:
+        # Cancel and close every attempt that lost the race
+        for stream, first in attempts:
+            if winner is not None and stream is winner[0]:
+                continue
+            if not first.done():
+                first.cancel()
+            elif not first.cancelled():
+                first.exception()  # Mark any error as retrieved
+            if hasattr(stream, "aclose"):
+                try:
+                    await stream.aclose()
+                except Exception:
+                    pass
+
+    stream, first = winner
+
+    if isinstance(first.exception(), StopAsyncIteration):
+        return
+
+    try:
+        yield first.result()
+
+        async for chunk in stream:
+            yield chunk
+
+    finally:
+        # Close the winner too if our consumer stopped early
+        if hasattr(stream, "aclose"):
+            await stream.aclose()
+
+
+class CircuitBreaker:
+    """Stops calling an unhealthy upstream until it has had time to recover"""
+
+    def __init__(self, failure_threshold, reset_timeout):
+        """
+        Initialize the circuit breaker
+
+        Args:
+            failure_threshold (int): Consecutive failures that open the circuit
+            reset_timeout (float): Seconds the circuit stays open before a trial call
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_started_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """
+        Check whether an upstream call may be made
+
+        Returns:
+            bool: False while the circuit is open
+        """
+        with self._lock:
+            now = time.monotonic()
+
+            if self.state == "open":
+                if now - self._opened_at < self.reset_timeout:
+                    return False
+                # Let a single trial call through
+                self.state = "half_open"
+                self._trial_started_at = now
+                return True
+
+            if self.state == "half_open":
+                # Only one trial at a time, unless the last one was abandoned
+                if now - self._trial_started_at < self.reset_timeout:
+                    return False
+                self._trial_started_at = now
+                return True
+
+            return True
+
+    def record_success(self):
+        """Record a successful upstream call"""
+        with self._lock:
+            self._failures = 0
+            self.state = "closed"
+
+    def record_failure(self):
+        """Record a failed or timed-out upstream call"""
+        with self._lock:
+            self._failures += 1
+
+            if self.state == "half_open" or self._failures >= self.failure_threshold:
+                self.state = "open"
+                self._opened_at = time.monotonic()
+
+
+_breaker = None
+_breaker_lock = threading.Lock()
+
+def get_circuit_breaker():
+    """
+    Get the process-wide circuit breaker for the LLM upstream
+
+    Returns:
+        CircuitBreaker: Shared circuit breaker
+    """
+    global _breaker
+
+    if _breaker is None:
+        with _breaker_lock:
+            if _breaker is None:
+                _breaker = CircuitBreaker(
+                    LLM_RESILIENCE_SETTINGS["breaker_failure_threshold"],
+                    LLM_RESILIENCE_SETTINGS["breaker_reset_timeout"]
+                )
+
+    return _breaker
@@ -0,0 +1,231 @@
+"""
+LLM Scheduler
+Priority-aware admission control for LLM API requests
+"""
+
+import time
+import heapq
+import asyncio
+import itertools
+import threading
+import contextlib
+from config.settings import LLM_SCHEDULER_SETTINGS
+from services.metrics import get_metrics_registry
+
+
+class LLMScheduler:
+    """Admits LLM requests by priority class, rate limit and per-class concurrency"""
+
+    def __init__(self, classes, requests_per_minute, burst, metrics=None):
+        """
+        Initialize the scheduler
+
+        Args:
+            classes (dict): Priority class name -> {"priority": int, "max_concurrency": int}
+                (lower priority values are served first)
+            requests_per_minute (float): Sustained request rate for the token bucket
+            burst (int): Maximum number of requests that can start back to back
+            metrics (MetricsRegistry): Receives queue depth and wait times
+                (defaults to the shared registry)
+        """
+        self.classes = classes
+        self.rate = requests_per_minute / 60.0
+        self.burst = burst
+
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self._waiters = []
+        self._sequence = itertools.count()
+        self._timer = None
+        self._active = {name: 0 for name in classes}
+        self.metrics = metrics or get_metrics_registry()
+
+    @contextlib.asynccontextmanager
+    async def slot(self, priority_class):
+        """
+        Wait for permission to make a request and hold it for the request's duration
+
+        Args:
+            priority_class (str): Name of the priority class making the request
+        """
+        if priority_class not in self.classes:
+            raise ValueError(f"Unknown priority class: {priority_class}")
+
+        loop = asyncio.get_running_loop()
+        granted = loop.create_future()
+        enqueued_at = time.monotonic()
+
+        heapq.heappush(self._waiters, (
+            self.classes[priority_class]["priority"],
+            next(self._sequence),
+            priority_class,
+            granted
+        ))
+
+        tags = {"priority_class": priority_class}
+        self.metrics.observe("llm.scheduler.queue_depth", self._queue_depth(priority_class), tags)
+
+        self._dispatch()
+
+        try:
+            await granted
+        except asyncio.CancelledError:
+            if granted.done() and not granted.cancelled():
+                # The slot was granted just as we were cancelled
+                self._release(priority_class)
+            else:
+                granted.cancel()
+            raise
+
+        self.metrics.observe("llm.scheduler.wait", time.monotonic() - enqueued_at, tags)
+
+        try:
+            yield
+        finally:
+            self._release(priority_class)
+
+    def try_acquire(self, priority_class):
+        """
+        Take a slot only if one is free right now, without queueing
+
+        For optional extra requests (such as hedges) that are only worth making
+        with spare capacity; requests already waiting always go first.
+
+        Args:
+            priority_class (str): Name of the priority class making the request
+
+        Returns:
+            bool: True if a slot was taken (give it back with release())
+        """
+        self._refill()
+
+        if (self._tokens < 1 or self._has_waiters()
+                or self._active[priority_class] >= self.classes[priority_class]["max_concurrency"]):
+            return False
+
+        self._tokens -= 1
+        self._active[priority_class] += 1
+        return True
+
+    def release(self, priority_class):
+        """Give back a slot taken with try_acquire()"""
+        self._release(priority_class)
+
+    def _queue_depth(self, priority_class):
+        """Count requests of a class still waiting for a slot"""
+        return sum(
+            1 for _, _, name, granted in self._waiters
+            if name == priority_class and not granted.done()
+        )
+
+    def _release(self, priority_class):
+        """Free a slot and admit the next waiting request"""
+        self._active[priority_class] -= 1
+        self._dispatch()
+
+    def _refill(self):
+        """Add tokens to the bucket for the time elapsed"""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def _dispatch(self):
+        """Admit waiting requests in priority order while tokens and slots allow"""
+        self._refill()
+        deferred = []
+
+        while self._waiters and self._tokens >= 1:
+            entry = heapq.heappop(self._waiters)
+            _, _, name, granted = entry
+
+            # Skip requests that gave up while waiting
+            if granted.done():
+                continue
+
+            # Class at its concurrency limit; let lower priorities use the token
+            if self._active[name] >= self.classes[name]["max_concurrency"]:
+                deferred.append(entry)
+                continue
+
+            self._tokens -= 1
+            self._active[name] += 1
+            granted.set_result(None)
+
+        for entry in deferred:
+            heapq.heappush(self._waiters, entry)
+
+        # Wake up again once the next token is available
+        if self._tokens < 1 and self._has_waiters() and self._timer is None:
+            delay = (1 - self._tokens) / self.rate
+            self._timer = asyncio.get_running_loop().call_later(delay, self._on_timer)
+
+    def _on_timer(self):
+        """Timer callback for when the token bucket has refilled"""
+        self._timer = None
+        self._dispatch()
+
+    def _has_waiters(self):
+        """Check whether any request is still waiting"""
+        return any(not granted.done() for _, _, _, granted in self._waiters)
+
+
+class SlotStream:
+    """Async iterator that gives back a scheduler slot when its stream ends or is closed"""
+
+    def __init__(self, stream, scheduler, priority_class):
+        """
+        Wrap a stream that was admitted with LLMScheduler.try_acquire()
+
+        Args:
+            stream: Async iterator making the request
+            scheduler (LLMScheduler): Scheduler the slot was taken from
+            priority_class (str): Priority class the slot belongs to
+        """
+        self.stream = stream
+        self.scheduler = scheduler
+        self.priority_class = priority_class
+        self._held = True
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return await self.stream.__anext__()
+        except BaseException:
+            # Finished, failed or cancelled
+            await self.aclose()
+            raise
+
+    async def aclose(self):
+        """Close the stream and give back the slot (safe to call more than once)"""
+        if self._held:
+            self._held = False
+            self.scheduler.release(self.priority_class)
+
+        if hasattr(self.stream, "aclose"):
+            await self.stream.aclose()
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+def get_llm_scheduler():
+    """
+    Get the process-wide LLM scheduler
+
+    Returns:
+        LLMScheduler: Shared scheduler instance
+    """
+    global _scheduler
+
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = LLMScheduler(
+                    LLM_SCHEDULER_SETTINGS["classes"],
+                    LLM_SCHEDULER_SETTINGS["requests_per_minute"],
+                    LLM_SCHEDULER_SETTINGS["burst"]
+                )
+
+    return _scheduler
@@ -5,21 +5,61 @@ Handles interactions with the Gemini LLM API
 
 import os
 import json
-import google.generativeai as genai
-from config.settings import LLM_SETTINGS
+import time
+from config.settings import LLM_SETTINGS, LLM_CACHE_SETTINGS, LLM_RESILIENCE_SETTINGS
+from services.llm_backends import create_backend
+from services.llm_cassette import apply_cassette
+from services.response_cache import get_response_cache, make_request_key
+from services.single_flight import get_single_flight
+from services.prompt_builder import PromptBuilder
+from services.llm_scheduler import get_llm_scheduler, SlotStream
+from services.event_loop import get_event_loop_thread
+from services.metrics import get_metrics_registry
+from services.llm_resilience import (
+    DeadlineExceeded, CircuitOpenError, iterate_with_deadline, hedged_stream, get_circuit_breaker
+)
 
 class LLMService:
     """Service for interacting with LLM APIs"""
     
-    def __init__(self):
+    def __init__(self, priority="interactive", caller="llm"):
+        """
+        Initialize the LLM service
+        
+        Args:
+            priority (str): Scheduler priority class for this service's requests
+            caller (str): Name of the workload, used to tag metrics
+        """
+        self.priority = priority
+        self.caller = caller
         self.api_key = self._load_api_key()
         self.model = LLM_SETTINGS["model"]
         self.max_tokens = LLM_SETTINGS["max_tokens"]
         self.temperature = LLM_SETTINGS["temperature"]
         
-        # Initialize Gemini API
-        if self.api_key:
-            genai.configure(api_key=self.api_key)
+        # Assemble prompts within the model's context budget
+        self.prompt_builder = PromptBuilder(LLM_SETTINGS["context_token_budget"])
+        
+        # Backend that actually generates text (Gemini or offline stub),
+        # optionally recorded to or replayed from a cassette
+        self.backend = apply_cassette(
+            lambda: create_backend(LLM_SETTINGS["backend"], self.api_key, self.model)
+        )
+        
+        # Optional response cache for repeated prompts
+        self.cache = get_response_cache() if LLM_CACHE_SETTINGS["enabled"] else None
+        
+        # Coalesce identical in-flight requests into one upstream call
+        self.single_flight = get_single_flight() if LLM_SETTINGS["coalesce_requests"] else None
+        
+        # Shared scheduler that orders requests by priority class
+        self.scheduler = get_llm_scheduler()
+        
+        # Latency and throughput measurements for every call
+        self.metrics = get_metrics_registry()
+        
+        # Fail fast while the upstream is unhealthy
+        self.breaker = get_circuit_breaker()
     
     def _load_api_key(self):
         """Load API key from file"""
@@ -36,82 +76,340 @@ class LLMService:
         # If we can't load from file, try environment variable
         return os.environ.get("GEMINI_API_KEY", "")
     
-    def get_response(self, system_prompt, conversation_history, user_message, callback=None):
+    def is_configured(self):
+        """Check whether the LLM backend is ready to serve requests"""
+        return self.backend.is_configured()
+    
+    def _get_generation_config(self):
+        """Get the generation config used for this service's requests"""
+        return {
+            "max_output_tokens": self.max_tokens,
+            "temperature": self.temperature
+        }
+    
+    async def stream_async(self, system_prompt, conversation_history, user_message, use_cache=True, stats=None):
         """
-        Get a response from the Gemini LLM API with optional streaming
+        Stream a response from the Gemini LLM API
+        
+        Args:
+            system_prompt (str): System instructions for the LLM
+            conversation_history (list): Previous conversation messages
+            user_message (str): The user's message
+            use_cache (bool): Set to False to bypass the response cache
+            stats (dict): Optional dict that receives prompt size, source and queue wait
+            
+        Yields:
+            str: Chunks of the LLM's response
+        """
+        if stats is None:
+            stats = {}
+        
+        full_prompt, prompt_tokens = self.prompt_builder.build(
+            system_prompt,
+            conversation_history,
+            user_message
+        )
+        stats["prompt_chars"] = len(full_prompt)
+        stats["prompt_tokens"] = prompt_tokens
+        stats["queue_wait"] = 0.0
+        
+        generation_config = self._get_generation_config()
+        request_key = make_request_key(
+            f"{self.backend.name}:{self.model}",
+            generation_config,
+            full_prompt
+        )
+        stats["request_key"] = request_key
+        
+        # Serve exact repeats from the response cache
+        cache_key = None
+        if self.cache and use_cache:
+            cache_key = request_key
+            cached_response = self.cache.get(cache_key)
+            
+            if cached_response is not None:
+                stats["source"] = "cache"
+                yield cached_response
+                return
+        
+        def upstream():
+            stats["source"] = "upstream"
+            return self._stream_model(full_prompt, generation_config, cache_key, stats)
+        
+        # Attach identical concurrent requests to a single upstream call. Flights
+        # are per priority class, so an interactive request never waits in the
+        # scheduler queue behind a background request it joined
+        if self.single_flight:
+            stats["source"] = "coalesced"
+            chunks = self.single_flight.stream((self.priority, request_key), upstream)
+        else:
+            chunks = upstream()
+        
+        async for chunk_text in chunks:
+            yield chunk_text
+    
+    async def _stream_model(self, full_prompt, generation_config, cache_key=None, stats=None):
+        """
+        Stream a prompt through the configured backend
+        
+        Args:
+            full_prompt (str): Fully assembled prompt
+            generation_config (dict): Generation parameters
+            cache_key (str): Optional key to store the completed response under
+            stats (dict): Optional dict that receives the scheduler queue wait
+            
+        Yields:
+            str: Chunks of the model's response
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError("LLM upstream is unavailable")
+        
+        response_text = ""
+        enqueued_at = time.monotonic()
+        
+        # Wait for the scheduler to admit this request
+        async with self.scheduler.slot(self.priority):
+            if stats is not None:
+                stats["queue_wait"] = time.monotonic() - enqueued_at
+            
+            # Interactive requests race a duplicate when the first token is slow
+            if self.priority == "interactive" and LLM_RESILIENCE_SETTINGS["hedge_enabled"]:
+                chunks = hedged_stream(
+                    lambda: self.backend.stream(full_prompt, generation_config),
+                    self._get_hedge_delay(),
+                    lambda: self._start_hedge(full_prompt, generation_config)
+                )
+            else:
+                chunks = self.backend.stream(full_prompt, generation_config)
+            
+            try:
+                async for chunk_text in chunks:
+                    response_text += chunk_text
+                    yield chunk_text
+            except Exception:
+                self.breaker.record_failure()
+                raise
+            
+            self.breaker.record_success()
+        
+        if cache_key and response_text:
+            self.cache.put(cache_key, response_text)
+    
+    def _start_hedge(self, full_prompt, generation_config):
+        """
+        Start the duplicate request for hedging, if the scheduler has room for it
+        
+        The hedge is a real API call, so it takes its own rate-limit token and
+        concurrency slot rather than riding on the primary's.
+        
+        Returns:
+            SlotStream: The duplicate's chunks, or None to skip hedging
+        """
+        if not self.scheduler.try_acquire(self.priority):
+            self.metrics.observe("llm.hedge_skipped", 1, {"caller": self.caller})
+            return None
+        
+        self.metrics.observe("llm.hedges", 1, {"caller": self.caller})
+        return SlotStream(self.backend.stream(full_prompt, generation_config), self.scheduler, self.priority)
+    
+    def _get_hedge_delay(self):
+        """Get how long to wait for a first chunk before sending a hedged duplicate"""
+        observed = self.metrics.percentile(
+            "llm.time_to_first_chunk",
+            LLM_RESILIENCE_SETTINGS["hedge_percentile"],
+            {"caller": self.caller, "source": "upstream"},
+            min_samples=LLM_RESILIENCE_SETTINGS["hedge_min_samples"]
+        )
+        
+        if observed is None:
+            return LLM_RESILIENCE_SETTINGS["hedge_default_delay"]
+        
+        return max(LLM_RESILIENCE_SETTINGS["hedge_min_delay"], observed)
+    
+    def _get_degraded_response(self, stats):
+        """Get a stale cached answer, or a fixed message, while the circuit is open"""
+        request_key = stats.get("request_key")
+        
+        if self.cache and request_key:
+            cached_response = self.cache.get(request_key, allow_stale=True)
+            if cached_response is not None:
+                return cached_response
+        
+        return LLM_RESILIENCE_SETTINGS["degraded_message"]
+    
+    async def get_response_async(self, system_prompt, conversation_history, user_message, callback=None, use_cache=True, deadline=None, raise_on_failure=False):
+        """
+        Get a response from the Gemini LLM API without blocking a thread
         
         Args:
             system_prompt (str): System instructions for the LLM
             conversation_history (list): Previous conversation messages
             user_message (str): The user's message
             callback (function): Optional callback for streaming responses
+            use_cache (bool): Set to False to bypass the response cache
+            deadline (Deadline): Optional deadline for the whole response
+            raise_on_failure (bool): Raise instead of returning a degraded,
+                cut-short or error text (for callers that store the result)
             
         Returns:
             str: The LLM's response
+            
+        Raises:
+            CircuitOpenError: If raise_on_failure and the circuit is open
+            DeadlineExceeded: If raise_on_failure and the deadline passed
+            Exception: If raise_on_failure and the request failed (or the
+                API key is not configured)
         """
-        if not self.api_key:
+        if not self.is_configured():
             error_msg = "API key not configured. Please set up your Gemini API key in config/api_keys.json."
+            if raise_on_failure:
+                raise RuntimeError(error_msg)
             if callback:
                 callback(error_msg)
             return error_msg
         
+        response_text = ""
+        stats = {}
+        started = time.monotonic()
+        first_chunk_at = None
+        chunk_count = 0
+        
         try:
-            # Combine system prompt and conversation history
-            full_prompt = system_prompt + "\n\n"
-            
-            # Add conversation history
-            for msg in conversation_history:
-                full_prompt += f"{msg.get('role', 'user').capitalize()}: {msg.get('content', '')}\n"
-            
-            # Add current user message
-            full_prompt += f"User: {user_message}\n"
-            full_prompt += "Assistant: "
-            
-            # Initialize the Gemini model
-            model = genai.GenerativeModel(
-                model_name=self.model,
-                generation_config={
-                    "max_output_tokens": self.max_tokens,
-                    "temperature": self.temperature
-                }
+            chunks = self.stream_async(
+                system_prompt,
+                conversation_history,
+                user_message,
+                use_cache=use_cache,
+                stats=stats
             )
             
-            # If a callback is provided, use streaming response
-            if callback:
-                response_text = ""
+            async for chunk_text in iterate_with_deadline(chunks, deadline):
+                if first_chunk_at is None:
+                    first_chunk_at = time.monotonic()
+                chunk_count += 1
                 
-                try:
-                    # Stream the response
-                    response = model.generate_content(
-                        full_prompt,
-                        stream=True
-                    )
-                    
-                    for chunk in response:
-                        if hasattr(chunk, 'text') and chunk.text:
-                            chunk_text = chunk.text
-                            response_text += chunk_text
-                            callback(chunk_text)
-                    
-                    return response_text
-                
-                except Exception as e:
-                    error_message = f"Error during streaming: {str(e)}"
-                    callback(error_message)
-                    return error_message
+                response_text += chunk_text
+                if callback:
+                    callback(chunk_text)
             
-            else:
-                # For non-streaming response
-                response = model.generate_content(full_prompt)
-                return response.text
-                
+            self._record_metrics(stats, started, first_chunk_at, chunk_count, len(response_text))
+            return response_text
+        
+        except CircuitOpenError:
+            self.metrics.observe("llm.circuit_open", 1, {"caller": self.caller})
+            if raise_on_failure:
+                raise
+            
+            degraded_response = self._get_degraded_response(stats)
+            if callback:
+                callback(degraded_response)
+            return degraded_response
+        
+        except DeadlineExceeded:
+            self.metrics.observe("llm.deadline_exceeded", 1, {"caller": self.caller})
+            
+            # A slow upstream counts against the breaker like an error
+            if stats.get("source") == "upstream":
+                self.breaker.record_failure()
+            if raise_on_failure:
+                raise
+            
+            timeout_note = "\n\n[The response took too long and was cut short. Please try again.]"
+            if callback:
+                callback(timeout_note)
+            return (response_text + timeout_note).strip()
+        
         except Exception as e:
-            error_message = f"Error communicating with Gemini API: {str(e)}"
+            self.metrics.observe("llm.errors", 1, {"caller": self.caller})
+            if raise_on_failure:
+                raise
+            
             if callback:
+                error_message = f"Error during streaming: {str(e)}"
                 callback(error_message)
+            else:
+                error_message = f"Error communicating with Gemini API: {str(e)}"
             return error_message
     
-    def get_response_sync(self, system_prompt, conversation_history, user_message):
+    def _record_metrics(self, stats, started, first_chunk_at, chunk_count, response_chars):
+        """Record timing and throughput measurements for a completed call"""
+        finished = time.monotonic()
+        tags = {"caller": self.caller}
+        
+        self.metrics.observe("llm.queue_wait", stats.get("queue_wait", 0.0), tags)
+        self.metrics.observe("llm.prompt_chars", stats.get("prompt_chars", 0), tags)
+        self.metrics.observe("llm.prompt_tokens", stats.get("prompt_tokens", 0), tags)
+        self.metrics.observe("llm.total_time", finished - started, tags)
+        self.metrics.observe("llm.chunk_count", chunk_count, tags)
+        self.metrics.observe(f"llm.source.{stats.get('source', 'upstream')}", 1, tags)
+        
+        if first_chunk_at is not None:
+            # Tagged by source so hedging can use upstream latency alone
+            self.metrics.observe(
+                "llm.time_to_first_chunk",
+                first_chunk_at - started,
+                dict(tags, source=stats.get("source", "upstream"))
+            )
+            
+            streaming_time = finished - first_chunk_at
+            if streaming_time > 0:
+                self.metrics.observe("llm.chars_per_second", response_chars / streaming_time, tags)
+    
+    def submit_response(self, system_prompt, conversation_history, user_message, callback=None, use_cache=True, deadline=None):
+        """
+        Schedule a response on the shared event loop without waiting for it
+        
+        Args:
+            system_prompt (str): System instructions for the LLM
+            conversation_history (list): Previous conversation messages
+            user_message (str): The user's message
+            callback (function): Optional callback for streaming responses
+            use_cache (bool): Set to False to bypass the response cache
+            deadline (Deadline): Optional deadline for the whole response
+            
+        Returns:
+            concurrent.futures.Future: Future resolving to the LLM's response
+        """
+        return get_event_loop_thread().submit(
+            self.get_response_async(
+                system_prompt,
+                conversation_history,
+                user_message,
+                callback,
+                use_cache,
+                deadline
+            )
+        )
+    
+    def get_response(self, system_prompt, conversation_history, user_message, callback=None, use_cache=True, deadline=None):
+        """
+        Get a response from the Gemini LLM API with optional streaming
+        
+        Blocking adapter over get_response_async for thread-based callers.
+        
+        Args:
+            system_prompt (str): System instructions for the LLM
+            conversation_history (list): Previous conversation messages
+            user_message (str): The user's message
+            callback (function): Optional callback for streaming responses
+            use_cache (bool): Set to False to bypass the response cache
+            deadline (Deadline): Optional deadline for the whole response
+            
+        Returns:
+            str: The LLM's response
+        """
+        return get_event_loop_thread().run(
+            self.get_response_async(
+                system_prompt,
+                conversation_history,
+                user_message,
+                callback,
+                use_cache,
+                deadline
+            )
+        )
+    
+    def get_response_sync(self, system_prompt, conversation_history, user_message, use_cache=True):
         """
         Get a synchronous response from the Gemini LLM API
         
@@ -119,8 +417,9 @@ class LLMService:
             system_prompt (str): System instructions for the LLM
             conversation_history (list): Previous conversation messages
             user_message (str): The user's message
+            use_cache (bool): Set to False to bypass the response cache
             
         Returns:
             str: The LLM's response
         """
-        return self.get_response(system_prompt, conversation_history, user_message)
\ No newline at end of file
+        return self.get_response(system_prompt, conversation_history, user_message, use_cache=use_cache)
\ No newline at end of file
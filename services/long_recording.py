@@ -0,0 +1,207 @@
+"""
+Long Recording
+Records long consultations to disk and transcribes them in overlapping windows
+"""
+
+import os
+import json
+import threading
+import numpy as np
+import pyaudio
+from datetime import datetime
+from config.settings import AUDIO_SETTINGS, LONG_RECORDING_SETTINGS
+
+
+def format_timestamp(seconds):
+    """Format seconds as HH:MM:SS"""
+    seconds = int(seconds)
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+class LongRecording:
+    """A consultation recording whose memory use does not grow with its length"""
+
+    def __init__(self, speech_service, output_dir, segment_callback=None):
+        """
+        Initialize the recording
+
+        Args:
+            speech_service (SpeechService): Provides the audio device and Whisper model
+            output_dir (str): Directory for the transcript (the user's conversations dir)
+            segment_callback (function): Optional callback receiving each stitched
+                segment as a dict with start, end and text
+        """
+        self.speech_service = speech_service
+        self.output_dir = output_dir
+        self.segment_callback = segment_callback
+
+        self.rate = AUDIO_SETTINGS["rate"]
+        self.window_samples = int(LONG_RECORDING_SETTINGS["window_seconds"] * self.rate)
+        self.overlap_seconds = LONG_RECORDING_SETTINGS["overlap_seconds"]
+        self.step_samples = self.window_samples - int(self.overlap_seconds * self.rate)
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        base_path = os.path.join(output_dir, f"consultation_{timestamp}")
+        self.audio_path = f"{base_path}.pcm"
+        self.segments_path = f"{base_path}_segments.jsonl"
+        self.transcript_path = f"{base_path}.txt"
+
+        self.segments = []
+        self.stream = None
+        self.recording = False
+        self.started_at = None
+
+        self._spill_file = None
+        self._samples_written = 0
+        self._committed_until = 0.0
+        self._stopped = threading.Event()
+        self._pipeline_thread = None
+
+    @property
+    def duration(self):
+        """Seconds of audio recorded so far"""
+        return self._samples_written / self.rate
+
+    def start(self):
+        """Start recording and the background transcription pipeline"""
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        # Unbuffered, so every block is visible to the memory-mapped reader
+        self._spill_file = open(self.audio_path, 'wb', buffering=0)
+        self._samples_written = 0
+        self._stopped.clear()
+        self.started_at = datetime.now()
+        self.recording = True
+
+        self.stream = self.speech_service.audio.open(
+            format=AUDIO_SETTINGS["format"],
+            channels=AUDIO_SETTINGS["channels"],
+            rate=self.rate,
+            input=True,
+            frames_per_buffer=AUDIO_SETTINGS["chunk"],
+            stream_callback=self._audio_callback
+        )
+        self.stream.start_stream()
+
+        self._pipeline_thread = threading.Thread(
+            target=self._run_pipeline,
+            name="long-recording-transcribe",
+            daemon=True
+        )
+        self._pipeline_thread.start()
+
+    def stop(self):
+        """
+        Stop recording and wait for the remaining audio to be transcribed
+
+        Returns:
+            str: Path to the saved transcript
+        """
+        if self.stream and self.recording:
+            self.recording = False
+            self.stream.stop_stream()
+            self.stream.close()
+            self.stream = None
+
+        if self._spill_file:
+            self._spill_file.close()
+            self._spill_file = None
+
+        self._stopped.set()
+        if self._pipeline_thread:
+            self._pipeline_thread.join()
+
+        self._save_transcript()
+
+        if not LONG_RECORDING_SETTINGS["keep_audio"] and os.path.exists(self.audio_path):
+            os.unlink(self.audio_path)
+
+        return self.transcript_path
+
+    def _audio_callback(self, in_data, frame_count, time_info, status):
+        """Append captured audio to the spill file"""
+        if self.recording and self._spill_file:
+            self._spill_file.write(in_data)
+            self._samples_written += len(in_data) // 2
+        return (in_data, pyaudio.paContinue)
+
+    def _run_pipeline(self):
+        """Transcribe overlapping windows as soon as enough audio is on disk"""
+        window_start = 0
+
+        while True:
+            finished = self._stopped.is_set()
+            available = self._samples_written
+
+            if available - window_start >= self.window_samples or (finished and available > window_start):
+                window_end = min(window_start + self.window_samples, available)
+                final = finished and window_end >= available
+
+                self._transcribe_window(window_start, window_end, final)
+
+                if final:
+                    return
+                window_start += self.step_samples
+
+            elif finished:
+                return
+
+            else:
+                self._stopped.wait(LONG_RECORDING_SETTINGS["poll_interval"])
+
+    def _transcribe_window(self, start, end, final):
+        """Transcribe one window and keep the segments it is responsible for"""
+        window_offset = start / self.rate
+
+        # Read just this window from disk; the rest of the recording stays out of memory
+        pcm = np.memmap(self.audio_path, dtype=np.int16, mode='r', offset=start * 2, shape=(end - start,))
+
+        # Segments near the end of a window are left to the next, overlapping window
+        cutoff = float("inf") if final else end / self.rate - self.overlap_seconds / 2
+
+        previous_text = " ".join(segment["text"] for segment in self.segments[-3:])
+
+        try:
+            segments = self.speech_service.transcribe_segments(pcm, previous_text or None)
+        except Exception as e:
+            print(f"Error transcribing recording window at {format_timestamp(window_offset)}: {str(e)}")
+            segments = []
+
+        for segment in segments:
+            segment_start = window_offset + segment.start
+            segment_end = window_offset + segment.end
+            midpoint = (segment_start + segment_end) / 2
+
+            # Already covered by the previous window, or belongs to the next one
+            if midpoint < self._committed_until or midpoint >= cutoff:
+                continue
+
+            text = segment.text.strip()
+            if text:
+                self._add_segment({
+                    "start": round(segment_start, 2),
+                    "end": round(segment_end, 2),
+                    "text": text
+                })
+
+        self._committed_until = cutoff
+
+    def _add_segment(self, segment):
+        """Record a stitched segment, appending it to disk straight away"""
+        self.segments.append(segment)
+
+        with open(self.segments_path, 'a') as f:
+            f.write(json.dumps(segment) + "\n")
+
+        if self.segment_callback:
+            self.segment_callback(segment)
+
+    def _save_transcript(self):
+        """Write the timestamped transcript"""
+        with open(self.transcript_path, 'w') as f:
+            f.write(f"Consultation recorded {self.started_at.strftime('%Y-%m-%d %H:%M')}, "
+                    f"duration {format_timestamp(self.duration)}\n\n")
+
+            for segment in self.segments:
+                f.write(f"[{format_timestamp(segment['start'])} - {format_timestamp(segment['end'])}] "
+                        f"{segment['text']}\n")
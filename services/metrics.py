@@ -0,0 +1,174 @@
+"""
+Metrics
+In-process registry of timing and throughput measurements
+"""
+
+import os
+import json
+import math
+import threading
+from collections import deque
+from datetime import datetime
+from config.settings import METRICS_SETTINGS
+
+
+def _percentile(sorted_values, percent):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(percent / 100.0 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class MetricsRegistry:
+    """Keeps recent samples per metric and tag set and summarizes them"""
+
+    def __init__(self, max_samples=1000):
+        """
+        Initialize the registry
+
+        Args:
+            max_samples (int): Number of recent samples kept per series
+        """
+        self.max_samples = max_samples
+        self._series = {}
+        self._lock = threading.Lock()
+        self._dump_thread = None
+        self._stop_dump = threading.Event()
+
+    def observe(self, name, value, tags=None):
+        """
+        Record a sample
+
+        Args:
+            name (str): Metric name (e.g. "llm.time_to_first_chunk")
+            value (float): Sample value
+            tags (dict): Labels identifying the workload (e.g. {"caller": "chat"})
+        """
+        key = (name, tuple(sorted((tags or {}).items())))
+
+        with self._lock:
+            samples = self._series.get(key)
+            if samples is None:
+                samples = deque(maxlen=self.max_samples)
+                self._series[key] = samples
+            samples.append(value)
+
+    def percentile(self, name, percent, tags=None, min_samples=1):
+        """
+        Get a percentile of one series
+
+        Args:
+            name (str): Metric name
+            percent (float): Percentile to compute (0-100)
+            tags (dict): Labels identifying the series
+            min_samples (int): Minimum samples required for a result
+
+        Returns:
+            float: The percentile, or None if there are too few samples
+        """
+        key = (name, tuple(sorted((tags or {}).items())))
+
+        with self._lock:
+            samples = list(self._series.get(key, ()))
+
+        if len(samples) < min_samples:
+            return None
+
+        samples.sort()
+        return _percentile(samples, percent)
+
+    def summary(self):
+        """
+        Summarize every series
+
+        Returns:
+            list: One dict per series with name, tags, count, mean, p50, p95 and max
+        """
+        with self._lock:
+            series = [(key, list(samples)) for key, samples in self._series.items()]
+
+        results = []
+        for (name, tags), samples in sorted(series):
+            samples.sort()
+            results.append({
+                "name": name,
+                "tags": dict(tags),
+                "count": len(samples),
+                "mean": sum(samples) / len(samples) if samples else 0.0,
+                "p50": _percentile(samples, 50),
+                "p95": _percentile(samples, 95),
+                "max": samples[-1] if samples else 0.0
+            })
+
+        return results
+
+    def dump(self, dump_dir):
+        """
+        Append the current summary to the day's JSON-lines metrics file
+
+        Args:
+            dump_dir (str): Directory for metrics files
+
+        Returns:
+            str: Path to the metrics file
+        """
+        os.makedirs(dump_dir, exist_ok=True)
+
+        now = datetime.now()
+        filepath = os.path.join(dump_dir, f"metrics_{now.strftime('%Y%m%d')}.jsonl")
+
+        with open(filepath, 'a') as f:
+            f.write(json.dumps({
+                "timestamp": now.isoformat(),
+                "metrics": self.summary()
+            }) + "\n")
+
+        return filepath
+
+    def start_periodic_dump(self, interval, dump_dir):
+        """
+        Dump metrics in a background thread every interval seconds
+
+        Args:
+            interval (float): Seconds between dumps
+            dump_dir (str): Directory for metrics files
+        """
+        if self._dump_thread and self._dump_thread.is_alive():
+            return
+
+        self._stop_dump.clear()
+
+        def dump_loop():
+            while not self._stop_dump.wait(interval):
+                try:
+                    self.dump(dump_dir)
+                except Exception as e:
+                    print(f"Error dumping metrics: {str(e)}")
+
+        self._dump_thread = threading.Thread(target=dump_loop, daemon=True)
+        self._dump_thread.start()
+
+    def stop_periodic_dump(self):
+        """Stop the periodic dump thread"""
+        self._stop_dump.set()
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+def get_metrics_registry():
+    """
+    Get the process-wide metrics registry
+
+    Returns:
+        MetricsRegistry: Shared registry instance
+    """
+    global _registry
+
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = MetricsRegistry(METRICS_SETTINGS["max_samples"])
+
+    return _registry
@@ -0,0 +1,88 @@
+"""
+Model Registry
+Process-wide registry of configured Gemini model instances
+"""
+
+import threading
+import google.generativeai as genai
+
+
+class ModelRegistry:
+    """Registry that hands out shared, ready-to-use Gemini models"""
+
+    def __init__(self):
+        self._models = {}
+        self._configured_key = None
+        self._lock = threading.Lock()
+
+    def configure(self, api_key):
+        """
+        Configure the Gemini client, skipping repeated calls with the same key
+
+        Args:
+            api_key (str): Gemini API key
+        """
+        if not api_key:
+            return
+
+        with self._lock:
+            if api_key == self._configured_key:
+                return
+
+            genai.configure(api_key=api_key)
+            self._configured_key = api_key
+
+            # Models created under a previous key are no longer valid
+            self._models.clear()
+
+    def get_model(self, model_name, generation_config):
+        """
+        Get a shared model instance for a model name and generation config
+
+        Args:
+            model_name (str): Name of the Gemini model
+            generation_config (dict): Generation parameters for the model
+
+        Returns:
+            genai.GenerativeModel: Cached model instance
+        """
+        key = self._make_key(model_name, generation_config)
+
+        with self._lock:
+            model = self._models.get(key)
+            if model is None:
+                model = genai.GenerativeModel(
+                    model_name=model_name,
+                    generation_config=dict(generation_config)
+                )
+                self._models[key] = model
+            return model
+
+    def clear(self):
+        """Drop all cached model instances"""
+        with self._lock:
+            self._models.clear()
+
+    def _make_key(self, model_name, generation_config):
+        """Build a hashable registry key"""
+        return (model_name, tuple(sorted(generation_config.items())))
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+def get_model_registry():
+    """
+    Get the process-wide model registry
+
+    Returns:
+        ModelRegistry: Shared registry instance
+    """
+    global _registry
+
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ModelRegistry()
+
+    return _registry
@@ -0,0 +1,113 @@
+"""
+Prompt Builder
+Assembles LLM prompts within a token budget
+"""
+
+import re
+import threading
+from collections import OrderedDict
+
+# Words, numbers and individual punctuation marks each count as a token piece
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+# Long words are split into several tokens by the model's tokenizer
+_CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text):
+    """
+    Estimate the number of tokens in a piece of text without calling the API
+
+    Args:
+        text (str): Text to measure
+
+    Returns:
+        int: Estimated token count
+    """
+    if not text:
+        return 0
+
+    count = 0
+    for piece in _TOKEN_PATTERN.findall(text):
+        count += (len(piece) + _CHARS_PER_TOKEN - 1) // _CHARS_PER_TOKEN
+
+    return count
+
+
+class PromptBuilder:
+    """Builds prompts from conversation history, newest turns first"""
+
+    def __init__(self, token_budget, max_cached_messages=1024):
+        """
+        Initialize the prompt builder
+
+        Args:
+            token_budget (int): Maximum estimated tokens for the whole prompt
+            max_cached_messages (int): Number of per-message token counts to remember
+        """
+        self.token_budget = token_budget
+        self.max_cached_messages = max_cached_messages
+        self._token_counts = OrderedDict()
+        self._lock = threading.Lock()
+
+    def build(self, system_prompt, conversation_history, user_message):
+        """
+        Assemble a prompt that fits the token budget
+
+        The system prompt and the user message are always included. History
+        turns are added from newest to oldest until the budget is used up.
+
+        Args:
+            system_prompt (str): System instructions for the LLM
+            conversation_history (list): Previous conversation messages
+            user_message (str): The user's message
+
+        Returns:
+            tuple: (prompt string, estimated token count)
+        """
+        header = system_prompt + "\n\n"
+        footer = f"User: {user_message}\nAssistant: "
+
+        used_tokens = estimate_tokens(header) + estimate_tokens(footer)
+        remaining = self.token_budget - used_tokens
+
+        # Walk history backwards so the most recent context is kept
+        history_lines = []
+        for msg in reversed(conversation_history):
+            line = self._format_message(msg)
+            tokens = self._count_message_tokens(msg, line)
+
+            if tokens > remaining:
+                break
+
+            history_lines.append(line)
+            remaining -= tokens
+            used_tokens += tokens
+
+        history_lines.reverse()
+
+        prompt = "".join([header, *history_lines, footer])
+        return prompt, used_tokens
+
+    def _format_message(self, msg):
+        """Format a history message as a prompt line"""
+        return f"{msg.get('role', 'user').capitalize()}: {msg.get('content', '')}\n"
+
+    def _count_message_tokens(self, msg, line):
+        """Get the token count for a message, measuring each message only once"""
+        key = (msg.get('role', 'user'), msg.get('content', ''))
+
+        with self._lock:
+            tokens = self._token_counts.get(key)
+            if tokens is not None:
+                self._token_counts.move_to_end(key)
+                return tokens
+
+        tokens = estimate_tokens(line)
+
+        with self._lock:
+            self._token_counts[key] = tokens
+            while len(self._token_counts) > self.max_cached_messages:
+                self._token_counts.popitem(last=False)
+
+        return tokens
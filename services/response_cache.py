@@ -0,0 +1,190 @@
+"""
+Response Cache
+Content-addressed cache for LLM responses with memory and disk tiers
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from config.settings import LLM_CACHE_SETTINGS
+
+
+def make_request_key(model_name, generation_config, prompt):
+    """
+    Hash everything that determines an LLM response
+
+    Args:
+        model_name (str): Name of the model
+        generation_config (dict): Generation parameters
+        prompt (str): Fully assembled prompt
+
+    Returns:
+        str: Hex digest identifying the request
+    """
+    payload = json.dumps(
+        [model_name, sorted(generation_config.items()), prompt],
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Two-tier (in-memory LRU + on-disk) cache of LLM responses"""
+
+    def __init__(self, cache_dir, max_entries=128, ttl=86400):
+        """
+        Initialize the response cache
+
+        Args:
+            cache_dir (str): Directory for the persistent cache tier
+            max_entries (int): Maximum number of entries kept in memory
+            ttl (float): Time to live for entries in seconds (None for no expiry)
+        """
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def get(self, key, allow_stale=False):
+        """
+        Look up a cached response
+
+        Args:
+            key (str): Cache key from make_request_key
+            allow_stale (bool): Return entries past their TTL (used as a fallback
+                while the upstream is unavailable)
+
+        Returns:
+            str: Cached response, or None on a miss
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if allow_stale or self._is_fresh(entry):
+                    self._memory.move_to_end(key)
+                    return entry["response"]
+                del self._memory[key]
+
+        # Fall back to the disk tier
+        entry = self._read_disk(key)
+        if entry is None:
+            return None
+
+        if allow_stale:
+            return entry["response"]
+
+        if not self._is_fresh(entry):
+            self._delete_disk(key)
+            return None
+
+        self._remember(key, entry)
+        return entry["response"]
+
+    def put(self, key, response):
+        """
+        Store a response in both tiers
+
+        Args:
+            key (str): Cache key from make_request_key
+            response (str): Response text to cache
+        """
+        entry = {
+            "created": time.time(),
+            "response": response
+        }
+
+        self._remember(key, entry)
+        self._write_disk(key, entry)
+
+    def clear(self):
+        """Remove all cached responses"""
+        with self._lock:
+            self._memory.clear()
+
+        for filename in os.listdir(self.cache_dir):
+            if filename.endswith(".json"):
+                try:
+                    os.remove(os.path.join(self.cache_dir, filename))
+                except OSError:
+                    pass
+
+    def _remember(self, key, entry):
+        """Insert an entry into the memory tier, evicting the oldest"""
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _is_fresh(self, entry):
+        """Check whether an entry is still within its TTL"""
+        if self.ttl is None:
+            return True
+        return time.time() - entry.get("created", 0) < self.ttl
+
+    def _get_path(self, key):
+        """Get the file path for a cache key"""
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _read_disk(self, key):
+        """Read an entry from the disk tier"""
+        path = self._get_path(key)
+
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, OSError):
+            return None
+
+    def _write_disk(self, key, entry):
+        """Write an entry to the disk tier atomically"""
+        path = self._get_path(key)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+
+        try:
+            with open(temp_path, 'w') as f:
+                json.dump(entry, f)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"Error writing response cache: {str(e)}")
+
+    def _delete_disk(self, key):
+        """Delete an entry from the disk tier"""
+        try:
+            os.remove(self._get_path(key))
+        except OSError:
+            pass
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_response_cache():
+    """
+    Get the process-wide response cache
+
+    Returns:
+        ResponseCache: Shared cache instance
+    """
+    global _cache
+
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResponseCache(
+                    LLM_CACHE_SETTINGS["cache_dir"],
+                    max_entries=LLM_CACHE_SETTINGS["max_entries"],
+                    ttl=LLM_CACHE_SETTINGS["ttl"]
+                )
+
+    return _cache
@@ -0,0 +1,119 @@
+"""
+Single Flight
+Coalesces concurrent identical streaming requests into one upstream call
+"""
+
+import asyncio
+import threading
+
+
+class _Flight:
+    """State of one in-flight upstream stream"""
+
+    def __init__(self):
+        self.chunks = []
+        self.done = False
+        self.error = None
+        self.changed = asyncio.Condition()
+        self.subscribers = 0
+        self.task = None
+
+
+class SingleFlight:
+    """Shares one upstream stream between all identical concurrent requests"""
+
+    def __init__(self):
+        self._flights = {}
+
+    async def stream(self, key, factory):
+        """
+        Stream chunks for a request, joining an identical in-flight one if present
+
+        Args:
+            key (hashable): Identity of the request
+            factory (function): Returns an async iterator of chunks for the upstream call
+
+        Yields:
+            str: Chunks of the response (late subscribers first receive earlier chunks)
+        """
+        flight = self._flights.get(key)
+
+        if flight is None:
+            flight = _Flight()
+            self._flights[key] = flight
+
+            # Run upstream in its own task so a cancelled subscriber does not
+            # cancel the stream for everyone else
+            flight.task = asyncio.ensure_future(self._run(key, flight, factory))
+
+        flight.subscribers += 1
+        position = 0
+
+        try:
+            while True:
+                async with flight.changed:
+                    await flight.changed.wait_for(
+                        lambda: position < len(flight.chunks) or flight.done
+                    )
+                    pending = flight.chunks[position:]
+                    finished = flight.done
+
+                for chunk in pending:
+                    yield chunk
+                position += len(pending)
+
+                if finished and position >= len(flight.chunks):
+                    break
+
+        finally:
+            flight.subscribers -= 1
+
+            # Nobody is left to read the response (all closed early or were
+            # cancelled): stop the upstream call so it frees its scheduler slot
+            if flight.subscribers == 0 and not flight.done:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+                flight.task.cancel()
+
+        if flight.error is not None:
+            raise flight.error
+
+    async def _run(self, key, flight, factory):
+        """Drive the upstream stream and publish chunks to subscribers"""
+        try:
+            async for chunk in factory():
+                async with flight.changed:
+                    flight.chunks.append(chunk)
+                    flight.changed.notify_all()
+
+        except Exception as e:
+            flight.error = e
+
+        finally:
+            # New requests after this point start a fresh upstream call
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+
+            async with flight.changed:
+                flight.done = True
+                flight.changed.notify_all()
+
+
+_single_flight = None
+_single_flight_lock = threading.Lock()
+
+def get_single_flight():
+    """
+    Get the process-wide single-flight group
+
+    Returns:
+        SingleFlight: Shared single-flight group
+    """
+    global _single_flight
+
+    if _single_flight is None:
+        with _single_flight_lock:
+            if _single_flight is None:
+                _single_flight = SingleFlight()
+
+    return _single_flight
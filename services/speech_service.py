@@ -4,16 +4,50 @@ Handles speech-to-text and text-to-speech functionality
 """
 
 import os
+import time
 import wave
+import shutil
 import tempfile
-import json
-import requests
+import subprocess
 import threading
+import json
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 import pyaudio
 from datetime import datetime
-from faster_whisper import WhisperModel
-from config.settings import AUDIO_SETTINGS, WHISPER_SETTINGS, TTS_SETTINGS
+from config.settings import (
+    AUDIO_SETTINGS, WHISPER_SETTINGS, TTS_SETTINGS, TTS_CACHE_SETTINGS, TRANSCRIPTION_DAEMON_SETTINGS
+)
+from services.whisper_registry import get_whisper_registry
+from services.whisper_tuning import get_transcription_settings, ensure_calibrated
+from services.transcription_daemon import get_transcription_client, TranscriptionDaemonUnavailable
+from services.audio_buffer import AudioBuffer
+from services.vad import VoiceActivityDetector
+from services.tts_pipeline import TTSPipeline
+from services.tts_cache import get_tts_cache, make_tts_key
+from services.tts_client import get_tts_client, AudioStream, TTSRequestError
+
+# Sample rate Whisper expects for in-memory audio
+WHISPER_SAMPLE_RATE = 16000
+
+
+class TranscriptionError(Exception):
+    """Raised when speech could not be transcribed"""
+
+
+def pcm_to_float32(pcm):
+    """
+    Convert int16 PCM samples to the float32 range [-1, 1) Whisper expects
+    
+    Args:
+        pcm (numpy.ndarray): int16 samples
+        
+    Returns:
+        numpy.ndarray: float32 samples
+    """
+    # One pass, straight into a float32 result
+    return np.multiply(pcm, 1.0 / 32768.0, dtype=np.float32)
+
 
 class SpeechService:
     """Service for speech recognition and synthesis"""
@@ -22,29 +56,71 @@ class SpeechService:
         self.recording = False
         self.audio = pyaudio.PyAudio()
         self.stream = None
-        self.frames = []
-        self.silence_threshold = AUDIO_SETTINGS["silence_threshold"]
-        self.silence_duration = AUDIO_SETTINGS["silence_duration"]
         
-        # Initialize whisper model
-        try:
-            model_size = WHISPER_SETTINGS["model_size"]
-            device = WHISPER_SETTINGS["device"]
-            model_path = WHISPER_SETTINGS["model_path"]
-            
-            # Only load model if the path exists
-            if os.path.exists(model_path):
-                self.whisper_model = WhisperModel(model_size, device=device, download_root=model_path)
-            else:
-                # Otherwise, use the default path
-                self.whisper_model = WhisperModel(model_size, device=device)
-                
-        except Exception as e:
-            print(f"Error loading Whisper model: {e}")
-            self.whisper_model = None
+        # Captured samples, written directly by the PyAudio callback
+        max_seconds = AUDIO_SETTINGS["buffer_max_seconds"]
+        self.buffer = AudioBuffer(
+            int(AUDIO_SETTINGS["buffer_initial_seconds"] * AUDIO_SETTINGS["rate"]),
+            int(max_seconds * AUDIO_SETTINGS["rate"]) if max_seconds else None
+        )
+        
+        # End-of-speech detection, run inside the audio callback
+        self.vad = VoiceActivityDetector(
+            AUDIO_SETTINGS["rate"],
+            on_speech_start=self._on_speech_start,
+            on_speech_end=self._on_speech_end,
+            on_segment_end=self._on_segment_end
+        )
+        
+        # Segments closed by the VAD are transcribed in order on one worker thread
+        self.transcription_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="transcribe")
+        self.streaming = False
+        self.partial_callback = None
+        self.transcript_parts = []
+        self.last_segment_end = 0
+        
+        # Shared Whisper model, loaded once per process in the background
+        # (with the tuned profile; the first run benchmarks one if clips exist)
+        self.whisper_registry = get_whisper_registry()
+        
+        # With a transcription daemon configured, the model lives there instead
+        self.transcription_client = get_transcription_client()
+        if self.transcription_client is None:
+            ensure_calibrated()
+            self.whisper_registry.preload()
         
         # Load TTS API key
         self.tts_api_key = self._load_tts_api_key()
+        
+        # Pooled connections to the TTS API; the player is found on first use
+        self.tts_client = get_tts_client()
+        self._stream_player = False
+        
+        # Previously synthesized phrases are played from disk
+        self.tts_cache = get_tts_cache() if TTS_CACHE_SETTINGS["enabled"] else None
+        
+        # Speaks streamed text sentence by sentence, synthesizing ahead of playback
+        self.tts_pipeline = TTSPipeline(
+            self._synthesize_speech,
+            self._play_synthesized,
+            concurrency=TTS_SETTINGS["synthesis_concurrency"],
+            min_sentence_chars=TTS_SETTINGS["min_sentence_chars"],
+            discard=self._discard_audio
+        )
+        
+        # What is playing right now, so barge-in can stop it
+        self._playback_lock = threading.Lock()
+        self._player_process = None
+        self._playing_stream = None
+        
+        # After barge-in, the rest of the interrupted response is not spoken
+        # (until begin_speaking() starts the next one)
+        self._tts_responding = False
+        self._tts_muted = False
+        
+        # Optional per-turn timelines (see services.voice_timeline)
+        self.listen_timeline = None
+        self.speak_timeline = None
     
     def _load_tts_api_key(self):
         """Load Elevenlabs API key from file"""
@@ -61,15 +137,33 @@ class SpeechService:
         # If we can't load from file, try environment variable
         return os.environ.get("ELEVENLABS_API_KEY", "")
     
-    def record_and_transcribe(self):
+    def record_and_transcribe(self, partial_callback=None, interrupt_speech=True, timeline=None):
         """
         Record audio and transcribe to text
         
+        Args:
+            partial_callback (function): Optional callback receiving the transcript
+                so far and whether it is final, called as segments are transcribed
+            interrupt_speech (bool): Stop any speech playing when recording starts
+                (speaking still interrupts it)
+            timeline (TurnTimeline): Optional timeline on which the end of speech
+                and the transcript are marked
+        
         Returns:
-            str: Transcribed text
+            str: Transcribed text ("" if nobody spoke)
+            
+        Raises:
+            TranscriptionError: If the speech could not be transcribed
         """
+        self.streaming = WHISPER_SETTINGS["streaming_transcription"]
+        self.partial_callback = partial_callback
+        self.transcript_parts = []
+        self.transcription_error = None
+        self.last_segment_end = 0
+        self.listen_timeline = timeline
+        
         # Start recording
-        self.start_recording()
+        self.start_recording(interrupt_speech)
         
         # Continue recording until silence is detected
         self.wait_for_silence()
@@ -77,13 +171,42 @@ class SpeechService:
         # Stop recording
         self.stop_recording()
         
-        # Transcribe the recorded audio
-        return self.transcribe_audio()
+        try:
+            if not self.vad.speech_detected:
+                # Whisper invents words in silence; there is nothing to transcribe
+                transcript = ""
+            elif not self.streaming:
+                # Transcribe the recorded audio in one pass
+                transcript = self.transcribe_audio()
+            else:
+                # Most segments are already transcribed; only the tail is left
+                transcript = self._finish_streaming_transcription()
+        finally:
+            self.streaming = False
+            self.listen_timeline = None
+        
+        if timeline and transcript:
+            timeline.mark("transcribed")
+        
+        if partial_callback:
+            partial_callback(transcript, True)
+        
+        return transcript
     
-    def start_recording(self):
-        """Start recording audio"""
+    def start_recording(self, interrupt_speech=True):
+        """
+        Start recording audio
+        
+        Args:
+            interrupt_speech (bool): Stop any speech playing (pressing the mic)
+        """
+        # Pressing the mic interrupts the assistant
+        if interrupt_speech and TTS_SETTINGS["barge_in"] and self.is_speaking:
+            self.stop_speaking()
+        
         self.recording = True
-        self.frames = []
+        self.buffer.clear()
+        self.vad.reset()
         
         # Configure audio stream
         self.stream = self.audio.open(
@@ -104,53 +227,87 @@ class SpeechService:
             self.stream.stop_stream()
             self.stream.close()
             self.stream = None
+        
+        # Wake anyone waiting for the end of the utterance
+        self.vad.speech_ended.set()
     
     def _audio_callback(self, in_data, frame_count, time_info, status):
         """Callback for audio stream"""
         if self.recording:
-            self.frames.append(in_data)
+            samples = np.frombuffer(in_data, dtype=np.int16)
+            self.buffer.write(samples)
+            self.vad.process(samples)
         return (in_data, pyaudio.paContinue)
     
     def wait_for_silence(self):
-        """Wait until silence is detected to stop recording"""
-        consecutive_silence = 0
-        samples_per_check = int(AUDIO_SETTINGS["rate"] / AUDIO_SETTINGS["chunk"] * 0.1)  # Check every 100ms
-        silence_limit = int(self.silence_duration * AUDIO_SETTINGS["rate"] / AUDIO_SETTINGS["chunk"])
-        
-        # We need some minimum audio
-        min_audio_length = int(1.0 * AUDIO_SETTINGS["rate"] / AUDIO_SETTINGS["chunk"])
-        
-        while self.recording:
-            # Wait until we have enough frames to check
-            if len(self.frames) < samples_per_check:
-                import time
-                time.sleep(0.1)
-                continue
-                
-            # Check if we have minimum audio
-            if len(self.frames) < min_audio_length:
-                import time
-                time.sleep(0.1)
-                continue
-            
-            # Check last 100ms of audio for silence
-            audio_data = np.frombuffer(b''.join(self.frames[-samples_per_check:]), dtype=np.int16)
+        """Wait until the voice activity detector reports the end of speech"""
+        # Set from the audio callback, or by stop_recording
+        self.vad.speech_ended.wait()
+    
+    def _on_speech_start(self, offset):
+        """Stop the assistant talking as soon as the user does (called from the audio callback)"""
+        # Without a headset this onset may be the assistant's own voice
+        if TTS_SETTINGS["barge_in_on_speech"] and self.is_speaking:
+            self.stop_speaking()
+    
+    def _on_speech_end(self, offset, speech_detected):
+        """Timestamp the end of the utterance (called from the audio callback)"""
+        timeline = self.listen_timeline
+        
+        if timeline and speech_detected:
+            # The user went quiet one hangover before the detector noticed
+            now = time.monotonic()
+            timeline.mark("speech_end", now - self.vad.hangover_frames * self.vad.frame_samples / self.vad.rate)
+            timeline.mark("end_detected", now)
+    
+    def _on_segment_end(self, start, end):
+        """Queue a segment closed by the VAD for transcription (audio callback thread)"""
+        if not self.streaming:
+            return
+        
+        self.last_segment_end = end
+        self.transcription_executor.submit(self._transcribe_segment, start, end)
+    
+    def _transcribe_segment(self, start, end):
+        """Transcribe one segment and report the transcript so far"""
+        try:
+            pcm = self.buffer.segment(start, end)
             
-            # Calculate volume
-            volume = np.abs(audio_data).mean()
+            # Earlier text helps Whisper keep wording consistent across segments
+            text = self.transcribe_pcm(pcm, initial_prompt=" ".join(self.transcript_parts) or None)
             
-            # Check if below silence threshold
-            if volume < self.silence_threshold:
-                consecutive_silence += 1
-                if consecutive_silence >= silence_limit:
-                    # Silence detected for the required duration
-                    break
-            else:
-                consecutive_silence = 0
-            
-            # Sleep a bit before next check
-            import time
-            time.sleep(0.1)
+            if text:
+                self.transcript_parts.append(text)
+                if self.partial_callback:
+                    self.partial_callback(" ".join(self.transcript_parts), False)
+        
+        except Exception as e:
+            print(f"Error transcribing segment: {str(e)}")
+            self.transcription_error = e
+    
+    def _finish_streaming_transcription(self):
+        """
+        Transcribe any audio after the last closed segment and join the results
+        
+        Raises:
+            TranscriptionError: If any segment failed to transcribe
+        """
+        end = self.buffer.total_written
+        
+        # Skip a tail of pure silence
+        if end > self.last_segment_end and self.vad.speech_detected and self.vad.segment_has_speech:
+            self.transcription_executor.submit(self._transcribe_segment, self.last_segment_end, end)
+        
+        # Wait for the worker to finish everything queued so far
+        transcript = self.transcription_executor.submit(
+            lambda: " ".join(self.transcript_parts)
+        ).result()
+        
+        # A transcript with a missing segment would misquote the user
+        if self.transcription_error:
+            raise TranscriptionError(str(self.transcription_error))
+        
+        return transcript
     
     def transcribe_audio(self):
         """
@@ -159,10 +316,80 @@ class SpeechService:
         Returns:
             str: Transcribed text
         """
-        if not self.frames:
+        if not len(self.buffer):
             return ""
         
-        # Save recorded audio to a temporary WAV file
+        return self.transcribe_pcm(self.buffer.view())
+    
+    def transcribe_pcm(self, pcm, initial_prompt=None):
+        """
+        Transcribe 16-bit PCM samples using Whisper
+        
+        Args:
+            pcm (numpy.ndarray): int16 samples at AUDIO_SETTINGS["rate"]
+            initial_prompt (str): Optional text preceding this audio
+            
+        Returns:
+            str: Transcribed text
+            
+        Raises:
+            TranscriptionError: If the model is unavailable or transcription failed
+        """
+        if pcm.size == 0:
+            return ""
+        
+        # Wait for the shared model if it is still loading
+        if (self.transcription_client is None
+                and self.whisper_registry.get_model_future().exception() is not None):
+            raise TranscriptionError("Speech recognition model not loaded properly.")
+        
+        try:
+            segments = self.transcribe_segments(pcm, initial_prompt)
+            return " ".join([segment.text for segment in segments]).strip()
+        
+        except Exception as e:
+            raise TranscriptionError(f"Error transcribing audio: {str(e)}") from e
+    
+    def transcribe_segments(self, pcm, initial_prompt=None):
+        """
+        Transcribe 16-bit PCM samples into timestamped Whisper segments
+        
+        Args:
+            pcm (numpy.ndarray): int16 samples at AUDIO_SETTINGS["rate"]
+            initial_prompt (str): Optional text preceding this audio
+            
+        Returns:
+            list: Segments with start and end (seconds into pcm) and text
+        """
+        # Whisper takes arrays only as 16 kHz mono; anything else goes through a file
+        in_memory = (
+            not WHISPER_SETTINGS["transcribe_via_wav"]
+            and AUDIO_SETTINGS["rate"] == WHISPER_SAMPLE_RATE
+            and AUDIO_SETTINGS["channels"] == 1
+        )
+        
+        options = {"beam_size": get_transcription_settings()["beam_size"]}
+        if initial_prompt:
+            options["initial_prompt"] = initial_prompt
+        
+        # The shared daemon takes 16 kHz mono PCM as is
+        if self.transcription_client and in_memory:
+            try:
+                return list(self.transcription_client.transcribe(pcm, initial_prompt))
+            except TranscriptionDaemonUnavailable as e:
+                if not TRANSCRIPTION_DAEMON_SETTINGS["fallback_to_local"]:
+                    raise
+                print(f"{str(e)}; transcribing in-process")
+        
+        with self.whisper_registry.use() as whisper_model:
+            if in_memory:
+                segments, _ = whisper_model.transcribe(pcm_to_float32(pcm), **options)
+                return list(segments)
+            
+            return self._transcribe_wav_file(whisper_model, pcm, options)
+    
+    def _transcribe_wav_file(self, whisper_model, pcm, options):
+        """Transcribe by way of a temporary WAV file (debug and resampling path)"""
         temp_file = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
         temp_filename = temp_file.name
         temp_file.close()
@@ -172,100 +399,250 @@ class SpeechService:
                 wf.setnchannels(AUDIO_SETTINGS["channels"])
                 wf.setsampwidth(self.audio.get_sample_size(AUDIO_SETTINGS["format"]))
                 wf.setframerate(AUDIO_SETTINGS["rate"])
-                wf.writeframes(b''.join(self.frames))
+                wf.writeframes(pcm.tobytes())
             
-            # Transcribe with WhisperModel if available
-            if self.whisper_model:
-                segments, _ = self.whisper_model.transcribe(temp_filename, beam_size=5)
-                transcription = " ".join([segment.text for segment in segments])
-                return transcription.strip()
-            else:
-                return "Speech recognition model not loaded properly."
-                
-        except Exception as e:
-            return f"Error transcribing audio: {str(e)}"
+            segments, _ = whisper_model.transcribe(temp_filename, **options)
+            return list(segments)
         
         finally:
             # Clean up temporary file
             if os.path.exists(temp_filename):
                 os.unlink(temp_filename)
     
-    def speak_text(self, text):
+    def speak_text(self, text, timeline=None):
         """
         Convert text to speech using Elevenlabs API
         
+        Text can arrive in streamed chunks; it is spoken sentence by sentence.
+        
         Args:
             text (str): Text to convert to speech
+            timeline (TurnTimeline): Optional timeline of the turn this text
+                answers; synthesis and playback are marked on it
         """
-        if not text or not self.tts_api_key:
+        if not text or not self.tts_api_key or self._tts_muted:
             return
         
-        # Only speak meaningful chunks of text to reduce API calls
-        if len(text.strip()) < 5:  # Skip very short chunks
-            return
-            
-        # Use a single background thread and cancel previous requests
-        if hasattr(self, 'tts_thread') and self.tts_thread.is_alive():
-            # A thread is already running - skip this chunk to avoid overlap
+        if timeline:
+            self.speak_timeline = timeline
+        
+        self._tts_responding = True
+        self.tts_pipeline.feed(text)
+    
+    def begin_speaking(self):
+        """Start a new response, so it is spoken even if the last one was interrupted"""
+        self._tts_muted = False
+        self._tts_responding = False
+    
+    def finish_speaking(self):
+        """Speak any buffered text that did not end with a full sentence"""
+        self._tts_responding = False
+        
+        # The response was interrupted; its remainder stays unspoken
+        if self._tts_muted:
             return
+        
+        if self.tts_api_key:
+            self.tts_pipeline.flush()
+    
+    @property
+    def is_speaking(self):
+        """Whether speech is playing or queued"""
+        return self.tts_pipeline.busy or self._player_process is not None
+    
+    def stop_speaking(self):
+        """
+        Barge-in: stop speaking immediately
+        
+        Stops the sentence that is playing, cancels queued synthesis and drops
+        any text of the current response that has not been spoken yet.
+        """
+        # Text still streaming in for the interrupted response is ignored
+        self._tts_muted = self._tts_responding
+        self.tts_pipeline.cancel()
+        
+        with self._playback_lock:
+            process = self._player_process
+            stream = self._playing_stream
+        
+        if stream:
+            stream.cancel()
+        
+        if process and process.poll() is None:
+            process.kill()
+    
+    def _synthesize_speech(self, text):
+        """
+        Synthesize one sentence with the Elevenlabs API
+        
+        Args:
+            text (str): Text to synthesize
             
-        # Start a new thread
-        self.tts_thread = threading.Thread(
-            target=self._speak_text_thread,
-            args=(text,),
-            daemon=True
-        )
-        self.tts_thread.start()
+        Returns:
+            str or AudioStream: Path to a cached MP3 file, the audio as it
+                downloads, or None on failure
+        """
+        voice_id = TTS_SETTINGS["voice_id"]
+        self._mark_speaking("first_sentence")
+        
+        # Repeated phrases (greetings, disclaimers) need no API call
+        cache_key = None
+        if self.tts_cache:
+            cache_key = make_tts_key(
+                text,
+                voice_id,
+                TTS_SETTINGS["model_id"],
+                TTS_SETTINGS["voice_settings"]
+            )
+            cached_file = self.tts_cache.get(cache_key)
+            if cached_file:
+                self._mark_speaking("audio_ready")
+                return cached_file
+        
+        on_complete = None
+        if cache_key:
+            on_complete = lambda audio_file: self.tts_cache.put(cache_key, audio_file)
+        
+        # Returns as soon as the API starts answering; audio keeps arriving in the background
+        try:
+            audio = self.tts_client.stream(
+                text,
+                self.tts_api_key,
+                voice_id,
+                TTS_SETTINGS["model_id"],
+                TTS_SETTINGS["voice_settings"],
+                on_complete=on_complete
+            )
+        except TTSRequestError as e:
+            print(str(e))
+            return None
+        
+        self._mark_speaking("audio_ready")
+        return audio
+    
+    def _mark_speaking(self, stage):
+        """Mark a synthesis or playback stage on the current turn's timeline"""
+        timeline = self.speak_timeline
+        if timeline:
+            timeline.mark(stage)
     
-    def _speak_text_thread(self, text):
-        """Background thread for text-to-speech processing"""
+    def _play_synthesized(self, audio):
+        """
+        Play a synthesized sentence
+        
+        Args:
+            audio (str or AudioStream): Cached audio file, or audio still downloading
+        """
+        if isinstance(audio, str):
+            self._play_audio(audio)
+            return
+        
+        player = self._find_stream_player() if TTS_SETTINGS["streaming_playback"] else None
+        
+        if player:
+            self._play_stream(player, audio)
+            return
+        
+        # No player can read from stdin: download first, then play the file
+        temp_file = tempfile.NamedTemporaryFile(suffix=".mp3", delete=False)
         try:
-            voice_id = TTS_SETTINGS["voice_id"]
+            with self._playback_lock:
+                self._playing_stream = audio
             
-            # API endpoint
-            url = f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}/stream"
+            with temp_file:
+                for chunk in audio:
+                    temp_file.write(chunk)
             
-            # Request headers
-            headers = {
-                "Accept": "audio/mpeg",
-                "Content-Type": "application/json",
-                "xi-api-key": self.tts_api_key
-            }
-            
-            # Request body
-            data = {
-                "text": text,
-                "model_id": "eleven_monolingual_v1",
-                "voice_settings": {
-                    "stability": 0.5,
-                    "similarity_boost": 0.5
-                }
-            }
+            if audio.complete:
+                self._play_audio(temp_file.name)
+        finally:
+            with self._playback_lock:
+                self._playing_stream = None
             
-            # Make the API request
-            response = requests.post(url, json=data, headers=headers, stream=True)
+            if os.path.exists(temp_file.name):
+                os.unlink(temp_file.name)
+    
+    def _discard_audio(self, audio):
+        """Release synthesized audio that was cancelled before playing"""
+        if isinstance(audio, AudioStream):
+            # Stop downloading audio nobody will hear
+            audio.cancel()
+    
+    def _play_stream(self, player, audio):
+        """
+        Pipe audio into a player as it downloads
+        
+        Args:
+            player (list): Player command reading MP3 from stdin
+            audio (AudioStream): Audio still downloading
+        """
+        process = self._start_player(player, stdin=subprocess.PIPE)
+        
+        with self._playback_lock:
+            self._playing_stream = audio
+        
+        try:
+            for chunk in audio:
+                process.stdin.write(chunk)
+                process.stdin.flush()
+                self._mark_speaking("first_audio")
+        except BrokenPipeError:
+            # The player exited early; stop downloading audio nobody will hear
+            audio.cancel()
+        finally:
+            try:
+                process.stdin.close()
+            except BrokenPipeError:
+                pass
             
-            if response.status_code == 200:
-                # Save to temporary file
-                temp_file = tempfile.NamedTemporaryFile(suffix=".mp3", delete=False)
-                temp_filename = temp_file.name
-                
-                for chunk in response.iter_content(chunk_size=1024):
-                    if chunk:
-                        temp_file.write(chunk)
-                
-                temp_file.close()
-                
-                # Play audio (platform dependent)
-                self._play_audio(temp_filename)
-                
-                # Clean up
-                os.unlink(temp_filename)
-            else:
-                print(f"TTS API error: {response.status_code} - {response.text}")
-                
-        except Exception as e:
-            print(f"Error in text-to-speech: {str(e)}")
+            self._wait_for_player(process)
+    
+    def _start_player(self, command, stdin=None):
+        """
+        Start an audio player that barge-in can stop
+        
+        Args:
+            command (list): Player command line
+            stdin: Passed to subprocess.Popen
+        
+        Returns:
+            subprocess.Popen: The running player
+        """
+        process = subprocess.Popen(
+            command,
+            stdin=stdin,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        
+        with self._playback_lock:
+            self._player_process = process
+        
+        return process
+    
+    def _wait_for_player(self, process):
+        """Wait for a player to finish (or be stopped) and forget it"""
+        process.wait()
+        
+        with self._playback_lock:
+            self._player_process = None
+            self._playing_stream = None
+    
+    def _find_stream_player(self):
+        """
+        Find an installed player that can decode MP3 from stdin
+        
+        Returns:
+            list: Player command, or None if none is installed
+        """
+        if self._stream_player is False:
+            self._stream_player = None
+            for command in TTS_SETTINGS["stream_players"]:
+                if shutil.which(command[0]):
+                    self._stream_player = command
+                    break
+        
+        return self._stream_player
     
     def _play_audio(self, audio_file):
         """
@@ -274,23 +651,25 @@ class SpeechService:
         Args:
             audio_file (str): Path to audio file
         """
+        self._mark_speaking("first_audio")
+        
         try:
             import platform
-            import subprocess
             
             system = platform.system()
             
             if system == 'Windows':
+                # Played by the default app, so barge-in cannot stop it
                 os.startfile(audio_file)
             elif system == 'Darwin':  # macOS
-                subprocess.call(['afplay', audio_file])
+                self._wait_for_player(self._start_player(['afplay', audio_file]))
             else:  # Linux
                 # Try mpg123 first, fall back to other players
                 players = ['mpg123', 'mpg321', 'mplayer', 'cvlc']
                 
                 for player in players:
                     try:
-                        subprocess.call([player, audio_file])
+                        self._wait_for_player(self._start_player([player, audio_file]))
                         break
                     except FileNotFoundError:
                         continue
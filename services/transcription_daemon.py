@@ -0,0 +1,255 @@
+"""
+Transcription Daemon
+Local Whisper server shared by every GuideAI process on the machine
+
+Run with:
+
+    python -m services.transcription_daemon
+
+and set TRANSCRIPTION_DAEMON_SETTINGS["socket_path"] so SpeechService uses it.
+
+Protocol (per request, several requests may share a connection):
+    client -> 4-byte big-endian header length, JSON header, int16 PCM
+              (header: samples, and optionally model_size, beam_size, initial_prompt)
+    server -> one JSON line per segment ({"type": "segment", "start", "end", "text"}),
+              then {"type": "done"} or {"type": "error", "message"}
+"""
+
+import os
+import json
+import socket
+import struct
+import asyncio
+import threading
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor
+from config.settings import TRANSCRIPTION_DAEMON_SETTINGS
+from services.whisper_registry import get_whisper_registry
+from services.whisper_tuning import get_transcription_settings, ensure_calibrated
+
+_HEADER_LENGTH = struct.Struct(">I")
+
+
+class TranscriptionDaemonUnavailable(Exception):
+    """Raised when the transcription daemon cannot be reached"""
+
+
+def _default_workers():
+    """One parallel transcription per two cores, so each gets at least two threads"""
+    return max(1, (os.cpu_count() or 1) // 2)
+
+
+class TranscriptionServer:
+    """Serves transcriptions from shared models over a Unix socket"""
+
+    def __init__(self, socket_path, workers=None, registry=None):
+        """
+        Initialize the server
+
+        Args:
+            socket_path (str): Unix socket to listen on
+            workers (int): Transcriptions run in parallel (defaults to one per two cores)
+            registry (WhisperRegistry): Holds the models (defaults to the shared one)
+        """
+        self.socket_path = socket_path
+        self.workers = workers or _default_workers()
+        self.cpu_threads = max(1, (os.cpu_count() or 1) // self.workers)
+        self.registry = registry or get_whisper_registry()
+
+        # Requests from every client share these workers; extra requests wait their turn
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="daemon-transcribe")
+
+    async def serve_forever(self):
+        """Listen until cancelled"""
+        if os.path.exists(self.socket_path):
+            # Left behind by a daemon that did not shut down cleanly
+            os.unlink(self.socket_path)
+
+        server = await asyncio.start_unix_server(self._handle_client, path=self.socket_path)
+        os.chmod(self.socket_path, TRANSCRIPTION_DAEMON_SETTINGS["socket_mode"])
+
+        # Load the default model before the first request arrives
+        self.registry.get_model_future(cpu_threads=self.cpu_threads, num_workers=self.workers)
+
+        print(f"Transcription daemon listening on {self.socket_path} with {self.workers} workers")
+
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+    async def _handle_client(self, reader, writer):
+        """Answer requests from one client connection until it closes"""
+        try:
+            while True:
+                try:
+                    (header_length,) = _HEADER_LENGTH.unpack(await reader.readexactly(_HEADER_LENGTH.size))
+                    header = json.loads(await reader.readexactly(header_length))
+                    pcm = await reader.readexactly(header["samples"] * 2)
+                except asyncio.IncompleteReadError:
+                    return
+
+                await self._transcribe(header, pcm, writer)
+
+        except (ConnectionError, json.JSONDecodeError, KeyError) as e:
+            print(f"Transcription daemon client error: {str(e)}")
+
+        finally:
+            writer.close()
+
+    async def _transcribe(self, header, pcm, writer):
+        """Transcribe one request on a worker, streaming segments back as they are decoded"""
+        loop = asyncio.get_running_loop()
+        messages = asyncio.Queue()
+
+        def send(message):
+            loop.call_soon_threadsafe(messages.put_nowait, message)
+
+        def run():
+            try:
+                audio = self._to_float32(pcm)
+
+                options = {"beam_size": header.get("beam_size") or get_transcription_settings()["beam_size"]}
+                if header.get("initial_prompt"):
+                    options["initial_prompt"] = header["initial_prompt"]
+
+                with self.registry.use(header.get("model_size"), cpu_threads=self.cpu_threads,
+                                       num_workers=self.workers) as model:
+                    segments, _ = model.transcribe(audio, **options)
+
+                    # Segments are decoded lazily; each is sent as soon as it exists
+                    for segment in segments:
+                        send({"type": "segment", "start": segment.start, "end": segment.end, "text": segment.text})
+
+                send({"type": "done"})
+
+            except Exception as e:
+                send({"type": "error", "message": str(e)})
+
+        loop.run_in_executor(self.executor, run)
+
+        while True:
+            message = await messages.get()
+            writer.write((json.dumps(message) + "\n").encode("utf-8"))
+            await writer.drain()
+
+            if message["type"] != "segment":
+                return
+
+    @staticmethod
+    def _to_float32(pcm):
+        """Convert int16 PCM bytes to the float32 samples Whisper expects"""
+        # Imported here so clients do not pay for numpy through this module
+        import numpy as np
+        return np.multiply(np.frombuffer(pcm, dtype=np.int16), 1.0 / 32768.0, dtype=np.float32)
+
+
+class TranscriptionClient:
+    """Sends audio to the transcription daemon"""
+
+    def __init__(self, socket_path, timeout=None):
+        """
+        Initialize the client
+
+        Args:
+            socket_path (str): The daemon's Unix socket
+            timeout (float): Seconds to wait on the daemon (defaults to TRANSCRIPTION_DAEMON_SETTINGS)
+        """
+        self.socket_path = socket_path
+        self.timeout = timeout or TRANSCRIPTION_DAEMON_SETTINGS["timeout"]
+
+    def transcribe(self, pcm, initial_prompt=None, beam_size=None, model_size=None):
+        """
+        Transcribe 16 kHz mono int16 samples
+
+        Args:
+            pcm (numpy.ndarray): int16 samples
+            initial_prompt (str): Optional text preceding this audio
+            beam_size (int): Beam size (defaults to the daemon's)
+            model_size (str): Whisper model size (defaults to the daemon's)
+
+        Yields:
+            SimpleNamespace: Segments with start, end and text, as they are decoded
+
+        Raises:
+            TranscriptionDaemonUnavailable: If the daemon cannot be reached
+            RuntimeError: If the daemon failed to transcribe the audio
+        """
+        header = json.dumps({
+            "samples": int(pcm.size),
+            "model_size": model_size,
+            "beam_size": beam_size,
+            "initial_prompt": initial_prompt,
+        }).encode("utf-8")
+
+        try:
+            connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            connection.settimeout(self.timeout)
+            connection.connect(self.socket_path)
+        except OSError as e:
+            raise TranscriptionDaemonUnavailable(f"Transcription daemon unavailable: {str(e)}")
+
+        with connection, connection.makefile("rb") as responses:
+            try:
+                connection.sendall(_HEADER_LENGTH.pack(len(header)) + header + pcm.tobytes())
+            except OSError as e:
+                raise TranscriptionDaemonUnavailable(f"Transcription daemon unavailable: {str(e)}")
+
+            for line in responses:
+                message = json.loads(line)
+
+                if message["type"] == "segment":
+                    yield SimpleNamespace(start=message["start"], end=message["end"], text=message["text"])
+                elif message["type"] == "error":
+                    raise RuntimeError(message["message"])
+                else:
+                    return
+
+        raise TranscriptionDaemonUnavailable("Transcription daemon closed the connection")
+
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_transcription_client():
+    """
+    Get the process-wide daemon client
+
+    Returns:
+        TranscriptionClient: Shared client, or None if no daemon is configured
+    """
+    global _client
+
+    socket_path = TRANSCRIPTION_DAEMON_SETTINGS["socket_path"]
+    if not socket_path:
+        return None
+
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = TranscriptionClient(socket_path)
+
+    return _client
+
+
+def main():
+    """Run the daemon on the configured socket"""
+    socket_path = TRANSCRIPTION_DAEMON_SETTINGS["socket_path"]
+    if not socket_path:
+        print('Set TRANSCRIPTION_DAEMON_SETTINGS["socket_path"] to run the transcription daemon')
+        return
+
+    # The daemon's models use the tuned profile like in-process ones do
+    ensure_calibrated()
+
+    server = TranscriptionServer(socket_path, TRANSCRIPTION_DAEMON_SETTINGS["workers"])
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+TTS Cache
+Content-addressed, size-bounded cache of synthesized speech audio
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import threading
+import unicodedata
+from collections import OrderedDict
+from config.settings import TTS_CACHE_SETTINGS
+
+
+def normalize_tts_text(text):
+    """Normalize text so trivially different strings share an audio file"""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def make_tts_key(text, voice_id, model_id, voice_settings):
+    """
+    Hash everything that determines the synthesized audio
+
+    Args:
+        text (str): Text to speak
+        voice_id (str): Voice used for synthesis
+        model_id (str): TTS model
+        voice_settings (dict): Voice parameters (stability, similarity, ...)
+
+    Returns:
+        str: Hex digest identifying the audio
+    """
+    payload = json.dumps(
+        [normalize_tts_text(text), voice_id, model_id, sorted(voice_settings.items())],
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TTSCache:
+    """On-disk LRU cache of synthesized audio files, bounded by total size"""
+
+    def __init__(self, cache_dir, max_bytes, extension=".mp3"):
+        """
+        Initialize the cache
+
+        Args:
+            cache_dir (str): Directory holding the cached audio files
+            max_bytes (int): Total size of cached audio before the least
+                recently used files are evicted
+            extension (str): File extension of the cached audio
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.extension = extension
+
+        # key -> file size, least recently used first
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._load_index()
+
+    def get(self, key):
+        """
+        Look up cached audio
+
+        Args:
+            key (str): Key from make_tts_key
+
+        Returns:
+            str: Path to the cached audio file, or None on a miss
+        """
+        path = self._path(key)
+
+        with self._lock:
+            if key not in self._entries:
+                return None
+
+            if not os.path.exists(path):
+                self._total_bytes -= self._entries.pop(key)
+                return None
+
+            self._entries.move_to_end(key)
+
+        # Persist recency across restarts
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        return path
+
+    def put(self, key, audio_file):
+        """
+        Move a synthesized audio file into the cache
+
+        Args:
+            key (str): Key from make_tts_key
+            audio_file (str): Path of the file to take ownership of
+
+        Returns:
+            str: Path to the cached copy
+        """
+        path = self._path(key)
+        size = os.path.getsize(audio_file)
+        # Temporary files may live on another filesystem
+        shutil.move(audio_file, path)
+
+        with self._lock:
+            if key in self._entries:
+                self._total_bytes -= self._entries.pop(key)
+
+            self._entries[key] = size
+            self._total_bytes += size
+            self._evict()
+
+        return path
+
+    def clear(self):
+        """Remove every cached file"""
+        with self._lock:
+            for key in self._entries:
+                self._remove_file(key)
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def _evict(self):
+        """Drop least recently used files until the cache fits (caller holds the lock)"""
+        # Always keep the newest entry, even if it alone exceeds the limit
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            self._remove_file(key)
+
+    def _load_index(self):
+        """Rebuild the LRU order from the files already on disk"""
+        entries = []
+
+        for filename in os.listdir(self.cache_dir):
+            if not filename.endswith(self.extension):
+                continue
+
+            stat = os.stat(os.path.join(self.cache_dir, filename))
+            entries.append((stat.st_mtime, filename[:-len(self.extension)], stat.st_size))
+
+        with self._lock:
+            for _, key, size in sorted(entries):
+                self._entries[key] = size
+                self._total_bytes += size
+            self._evict()
+
+    def _remove_file(self, key):
+        """Delete a cached file if it still exists"""
+        try:
+            os.unlink(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def _path(self, key):
+        """Path of the audio file for a key"""
+        return os.path.join(self.cache_dir, f"{key}{self.extension}")
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_tts_cache():
+    """
+    Get the process-wide TTS audio cache
+
+    Returns:
+        TTSCache: Shared cache instance
+    """
+    global _cache
+
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = TTSCache(
+                    TTS_CACHE_SETTINGS["cache_dir"],
+                    TTS_CACHE_SETTINGS["max_bytes"]
+                )
+
+    return _cache
@@ -0,0 +1,195 @@
+"""
+TTS Client
+Streaming Elevenlabs client with a pooled HTTP session
+"""
+
+import os
+import queue
+import tempfile
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from config.settings import TTS_SETTINGS
+
+
+class TTSRequestError(Exception):
+    """Raised when the TTS API rejects a request"""
+
+
+class AudioStream:
+    """Synthesized audio arriving over HTTP, read ahead on a background thread"""
+
+    def __init__(self, response, chunk_size=4096, on_complete=None):
+        """
+        Start reading a streamed response
+
+        Args:
+            response (requests.Response): Streaming response with the audio
+            chunk_size (int): Bytes read per chunk
+            on_complete (function): Optional callback receiving the path of a
+                temporary file with the whole audio once the download finishes
+                (it takes ownership of the file)
+        """
+        self.response = response
+        self.chunk_size = chunk_size
+        self.on_complete = on_complete
+        self.complete = False
+        self.cancelled = False
+
+        self._chunks = queue.Queue()
+        self._spool_file = None
+
+        if on_complete:
+            self._spool_file = tempfile.NamedTemporaryFile(suffix=".mp3", delete=False)
+
+        # Read ahead so the next sentence downloads while this one is queued
+        self._reader = threading.Thread(target=self._read, name="tts-stream-reader", daemon=True)
+        self._reader.start()
+
+    def __iter__(self):
+        """
+        Yield audio chunks as they arrive
+
+        Raises:
+            Exception: If the download failed part way through
+        """
+        while True:
+            chunk = self._chunks.get()
+
+            if chunk is None:
+                return
+            if isinstance(chunk, Exception):
+                raise chunk
+
+            yield chunk
+
+    def cancel(self):
+        """Stop downloading and discard the audio"""
+        self.cancelled = True
+        self.response.close()
+
+    def _read(self):
+        """Copy the response body into the chunk queue (and spool file)"""
+        try:
+            for chunk in self.response.iter_content(chunk_size=self.chunk_size):
+                if self.cancelled:
+                    break
+                if chunk:
+                    if self._spool_file:
+                        self._spool_file.write(chunk)
+                    self._chunks.put(chunk)
+            else:
+                self.complete = True
+
+        except Exception as e:
+            if not self.cancelled:
+                self._chunks.put(e)
+
+        finally:
+            self.response.close()
+            self._chunks.put(None)
+            self._finish_spool()
+
+    def _finish_spool(self):
+        """Hand a complete download to on_complete, or delete a partial one"""
+        if not self._spool_file:
+            return
+
+        self._spool_file.close()
+
+        try:
+            if self.complete:
+                self.on_complete(self._spool_file.name)
+        except Exception as e:
+            print(f"Error saving synthesized audio: {str(e)}")
+        finally:
+            if os.path.exists(self._spool_file.name):
+                os.unlink(self._spool_file.name)
+
+
+class TTSClient:
+    """Client for the Elevenlabs streaming text-to-speech endpoint"""
+
+    def __init__(self, api_base_url=None, pool_size=None):
+        """
+        Initialize the client
+
+        Args:
+            api_base_url (str): Base URL of the API (a local stand-in in tests)
+            pool_size (int): Kept-alive connections to the API
+        """
+        self.api_base_url = (api_base_url or TTS_SETTINGS["api_base_url"]).rstrip("/")
+
+        # One pooled session so sentences reuse warm connections
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_size or TTS_SETTINGS["synthesis_concurrency"]
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def stream(self, text, api_key, voice_id, model_id, voice_settings, on_complete=None):
+        """
+        Start synthesizing text
+
+        Returns once the response headers arrive; the audio keeps downloading
+        in the background.
+
+        Args:
+            text (str): Text to synthesize
+            api_key (str): Elevenlabs API key
+            voice_id (str): Voice to use
+            model_id (str): TTS model
+            voice_settings (dict): Voice parameters
+            on_complete (function): Optional callback receiving a temporary
+                file with the whole audio once it has downloaded
+
+        Returns:
+            AudioStream: The audio as it arrives
+
+        Raises:
+            TTSRequestError: If the API rejects the request
+        """
+        response = self.session.post(
+            f"{self.api_base_url}/text-to-speech/{voice_id}/stream",
+            json={
+                "text": text,
+                "model_id": model_id,
+                "voice_settings": voice_settings
+            },
+            headers={
+                "Accept": "audio/mpeg",
+                "Content-Type": "application/json",
+                "xi-api-key": api_key
+            },
+            stream=True,
+            timeout=TTS_SETTINGS["request_timeout"]
+        )
+
+        if response.status_code != 200:
+            message = f"TTS API error: {response.status_code} - {response.text}"
+            response.close()
+            raise TTSRequestError(message)
+
+        return AudioStream(response, TTS_SETTINGS["stream_chunk_size"], on_complete)
+
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_tts_client():
+    """
+    Get the process-wide TTS client
+
+    Returns:
+        TTSClient: Shared client instance
+    """
+    global _client
+
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = TTSClient()
+
+    return _client
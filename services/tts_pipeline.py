@@ -0,0 +1,206 @@
+"""
+TTS Pipeline
+Turns streamed text into sentences, synthesizes ahead and plays them in order
+"""
+
+import re
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Sentence end: punctuation followed by whitespace, or a line break
+_SENTENCE_END = re.compile(r"(?<=[.!?])[\"')\]]*\s+|\n+")
+
+# Abbreviations that end in a period without ending the sentence
+_ABBREVIATIONS = {"dr.", "mr.", "mrs.", "ms.", "e.g.", "i.e.", "vs.", "etc.", "approx."}
+
+
+class SentenceBuffer:
+    """Accumulates streamed text and releases whole sentences"""
+
+    def __init__(self, min_chars=20):
+        """
+        Initialize the buffer
+
+        Args:
+            min_chars (int): Shorter sentences are joined with the next one
+        """
+        self.min_chars = min_chars
+        self._text = ""
+
+    def feed(self, text):
+        """
+        Add streamed text
+
+        Args:
+            text (str): Next chunk of text
+
+        Returns:
+            list: Sentences completed by this chunk
+        """
+        self._text += text
+        sentences = []
+        start = 0
+
+        for match in _SENTENCE_END.finditer(self._text):
+            candidate = self._text[start:match.end()].strip()
+
+            following = self._text[match.end():]
+            if self._ends_in_abbreviation(candidate, following) or len(candidate) < self.min_chars:
+                continue
+
+            sentences.append(candidate)
+            start = match.end()
+
+        self._text = self._text[start:]
+        return sentences
+
+    @staticmethod
+    def _ends_in_abbreviation(candidate, following):
+        """Check whether a candidate sentence only stops at an abbreviation"""
+        words = candidate.lower().split()
+        last_word = words[-1].lstrip("(\"'") if words else ""
+
+        if last_word in _ABBREVIATIONS:
+            return True
+
+        # "No." means "number" only before a digit ("No. 5"); wait to see what follows
+        return last_word == "no." and (not following or following[0].isdigit())
+
+    def flush(self):
+        """
+        Release whatever text is left
+
+        Returns:
+            str: Remaining text (may be empty)
+        """
+        text = self._text.strip()
+        self._text = ""
+        return text
+
+    def clear(self):
+        """Discard buffered text"""
+        self._text = ""
+
+
+class TTSPipeline:
+    """Synthesizes upcoming sentences while earlier ones are playing"""
+
+    def __init__(self, synthesize, play, concurrency=2, min_sentence_chars=20, discard=None):
+        """
+        Initialize the pipeline
+
+        Args:
+            synthesize (function): Turns text into playable audio, such as a
+                file path or a stream (or None on failure)
+            play (function): Plays synthesized audio, blocking until it finishes
+            concurrency (int): Sentences synthesized at the same time
+            min_sentence_chars (int): Shorter sentences are joined with the next one
+            discard (function): Optional callback releasing synthesized audio
+                that was cancelled before it could play
+        """
+        self.synthesize = synthesize
+        self.play = play
+        self.discard = discard
+
+        self.sentences = SentenceBuffer(min_sentence_chars)
+        self.synthesis_executor = ThreadPoolExecutor(
+            max_workers=concurrency,
+            thread_name_prefix="tts-synthesize"
+        )
+
+        # (generation, synthesis future) in speaking order
+        self.playback_queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._playback_thread = None
+
+        # Bumped by cancel(); queued work from an older generation is dropped
+        self._generation = 0
+
+    def feed(self, text):
+        """
+        Add streamed text; complete sentences are queued for speaking
+
+        Args:
+            text (str): Next chunk of text
+        """
+        with self._lock:
+            for sentence in self.sentences.feed(text):
+                self._enqueue(sentence)
+
+    def flush(self):
+        """Queue any trailing text that did not end with punctuation"""
+        with self._lock:
+            text = self.sentences.flush()
+            if text:
+                self._enqueue(text)
+
+    @property
+    def busy(self):
+        """Whether any sentence is still waiting to be synthesized or played"""
+        return self.playback_queue.unfinished_tasks > 0
+
+    def cancel(self):
+        """
+        Drop everything not yet spoken
+
+        Buffered text is discarded, queued synthesis that has not started is
+        cancelled and finished or in-flight audio is discarded instead of played.
+        Stopping the sentence that is playing right now is up to the caller.
+        """
+        with self._lock:
+            self._generation += 1
+            self.sentences.clear()
+
+            while True:
+                try:
+                    _, future = self.playback_queue.get_nowait()
+                except queue.Empty:
+                    break
+
+                if not future.cancel():
+                    future.add_done_callback(self._discard_future)
+                self.playback_queue.task_done()
+
+    def _discard_future(self, future):
+        """Release the audio of a cancelled sentence once its synthesis finishes"""
+        if future.cancelled() or future.exception() or not self.discard:
+            return
+
+        audio = future.result()
+        if audio:
+            self.discard(audio)
+
+    def _enqueue(self, sentence):
+        """Start synthesizing a sentence and queue it for playback (caller holds the lock)"""
+        future = self.synthesis_executor.submit(self.synthesize, sentence)
+        self.playback_queue.put((self._generation, future))
+
+        if self._playback_thread is None or not self._playback_thread.is_alive():
+            self._playback_thread = threading.Thread(
+                target=self._playback_loop,
+                name="tts-playback",
+                daemon=True
+            )
+            self._playback_thread.start()
+
+    def _playback_loop(self):
+        """Play synthesized sentences in the order they were queued"""
+        while True:
+            generation, future = self.playback_queue.get()
+
+            try:
+                audio = future.result()
+
+                # Cancelled while it was being synthesized
+                if generation != self._generation:
+                    if audio and self.discard:
+                        self.discard(audio)
+                elif audio:
+                    self.play(audio)
+
+            except Exception as e:
+                print(f"Error in text-to-speech: {str(e)}")
+
+            finally:
+                self.playback_queue.task_done()
@@ -0,0 +1,202 @@
+"""
+Voice Activity Detection
+Incremental energy-based speech detection, run inside the audio callback
+"""
+
+import threading
+import numpy as np
+from config.settings import AUDIO_SETTINGS, VAD_SETTINGS
+
+
+class VoiceActivityDetector:
+    """Detects the start and end of speech from a stream of int16 samples"""
+
+    def __init__(self, rate=None, settings=None, on_speech_start=None, on_speech_end=None,
+                 on_segment_end=None):
+        """
+        Initialize the detector
+
+        Args:
+            rate (int): Sample rate of the audio (defaults to AUDIO_SETTINGS)
+            settings (dict): Overrides for VAD_SETTINGS
+            on_speech_start (function): Called with the sample offset where speech starts
+            on_speech_end (function): Called with the sample offset where end of
+                speech is detected and whether any speech was heard
+            on_segment_end (function): Called with the start and end sample offsets
+                of each segment closed by a short pause
+        """
+        settings = dict(VAD_SETTINGS, **(settings or {}))
+
+        self.rate = rate or AUDIO_SETTINGS["rate"]
+        self.frame_samples = int(self.rate * settings["frame_ms"] / 1000)
+        self.speech_ratio = settings["speech_ratio"]
+        self.min_threshold = settings["min_threshold"]
+        self.noise_adapt_rate = settings["noise_adapt_rate"]
+        self.noise_creep_rate = settings["noise_creep_rate"]
+        self.calibration_percentile = settings["calibration_percentile"]
+        self.max_calibrated_floor = settings["max_calibrated_floor"]
+        self.initial_noise_floor = settings["initial_noise_floor"]
+        self.min_speech_frames = settings["min_speech_frames"]
+        self.calibration_frames = self._to_frames(settings["calibration_ms"])
+        self.hangover_frames = self._to_frames(settings["hangover_ms"])
+        self.no_speech_frames = self._to_frames(settings["no_speech_timeout_ms"])
+        self.segment_pause_frames = self._to_frames(settings["segment_pause_ms"])
+        self.min_segment_samples = int(settings["min_segment_ms"] / 1000 * self.rate)
+        self.max_segment_samples = int(settings["max_segment_ms"] / 1000 * self.rate)
+        self.max_utterance_samples = int(settings["max_utterance_ms"] / 1000 * self.rate)
+
+        self.on_speech_start = on_speech_start
+        self.on_speech_end = on_speech_end
+        self.on_segment_end = on_segment_end
+
+        # Set when end of speech (or a timeout with no speech) is detected
+        self.speech_ended = threading.Event()
+
+        self.reset()
+
+    def reset(self):
+        """Start detection afresh for a new recording"""
+        self.noise_floor = self.initial_noise_floor
+        self.in_speech = False
+        self.speech_detected = False
+        self.samples_seen = 0
+        self.speech_started_at = None
+        self.speech_ended_at = None
+        self.segment_start = 0
+        self.segment_has_speech = False
+
+        self._remainder = np.zeros(0, dtype=np.int16)
+        self._frames_seen = 0
+        self._calibration_levels = []
+        self._loud_frames = 0
+        self._quiet_frames = 0
+        self._frames_without_speech = 0
+        self.speech_ended.clear()
+
+    @property
+    def threshold(self):
+        """Current RMS level above which a frame counts as speech"""
+        return max(self.min_threshold, self.noise_floor * self.speech_ratio)
+
+    def process(self, samples):
+        """
+        Feed newly captured samples
+
+        Cheap enough to call from the PyAudio callback.
+
+        Args:
+            samples (numpy.ndarray or bytes): int16 samples
+        """
+        if self.speech_ended.is_set():
+            return
+
+        if isinstance(samples, (bytes, bytearray)):
+            samples = np.frombuffer(samples, dtype=np.int16)
+
+        # Carry partial frames over to the next call
+        if len(self._remainder):
+            samples = np.concatenate((self._remainder, samples))
+
+        num_frames = len(samples) // self.frame_samples
+        used = num_frames * self.frame_samples
+        self._remainder = samples[used:].copy()
+
+        if not num_frames:
+            return
+
+        frames = samples[:used].reshape(num_frames, self.frame_samples).astype(np.float32)
+        levels = np.sqrt(np.mean(frames * frames, axis=1))
+
+        for level in levels:
+            self.samples_seen += self.frame_samples
+            self._process_frame(float(level))
+
+            if self.speech_ended.is_set():
+                return
+
+    def _process_frame(self, level):
+        """Update the detector state with one frame's RMS level"""
+        self._frames_seen += 1
+
+        # Measure the room before listening for speech. A low percentile rather
+        # than the mean, so talking right away does not raise the floor
+        if self._frames_seen <= self.calibration_frames:
+            self._calibration_levels.append(level)
+            if self._frames_seen == self.calibration_frames:
+                floor = np.percentile(self._calibration_levels, self.calibration_percentile)
+                self.noise_floor = min(float(floor), self.max_calibrated_floor)
+            return
+
+        threshold = self.threshold
+
+        if level > threshold:
+            self._loud_frames += 1
+            self._quiet_frames = 0
+            if self.in_speech:
+                self.segment_has_speech = True
+
+                # Real speech pauses between words and pulls the floor back down;
+                # steady noise never does, so the floor slowly rises past it
+                self.noise_floor += self.noise_creep_rate * (level - self.noise_floor)
+        else:
+            self._loud_frames = 0
+            self._quiet_frames += 1
+
+            # Track the background level while nobody is talking (and any dip below it)
+            if not self.in_speech or level < self.noise_floor:
+                self.noise_floor += self.noise_adapt_rate * (level - self.noise_floor)
+
+        if not self.in_speech:
+            if self._loud_frames >= self.min_speech_frames:
+                self.in_speech = True
+                self.speech_detected = True
+                self.segment_has_speech = True
+                self.speech_started_at = self.samples_seen - self._loud_frames * self.frame_samples
+                if self.on_speech_start:
+                    self.on_speech_start(self.speech_started_at)
+                return
+
+            # Give up if nobody starts talking
+            if not self.speech_detected:
+                self._frames_without_speech += 1
+                if self.no_speech_frames and self._frames_without_speech >= self.no_speech_frames:
+                    self._end_speech()
+            return
+
+        # Hangover: only end once the quiet has lasted long enough. Never let an
+        # utterance run forever, in case noise keeps it open
+        if (self._quiet_frames >= self.hangover_frames
+                or (self.max_utterance_samples
+                    and self.samples_seen - self.speech_started_at >= self.max_utterance_samples)):
+            self.in_speech = False
+            self._end_speech()
+            return
+
+        # A short pause (or very long speech) closes a segment
+        if (self._quiet_frames == self.segment_pause_frames
+                or self.samples_seen - self.segment_start >= self.max_segment_samples):
+            self._end_segment()
+
+    def _end_segment(self):
+        """Close the current segment so it can be transcribed"""
+        if not self.segment_has_speech or self.samples_seen - self.segment_start < self.min_segment_samples:
+            return
+
+        start = self.segment_start
+        self.segment_start = self.samples_seen
+        self.segment_has_speech = False
+
+        if self.on_segment_end:
+            self.on_segment_end(start, self.samples_seen)
+
+    def _end_speech(self):
+        """Signal that the utterance is over"""
+        self.speech_ended_at = self.samples_seen
+        self.speech_ended.set()
+
+        if self.on_speech_end:
+            self.on_speech_end(self.speech_ended_at, self.speech_detected)
+
+    def _to_frames(self, milliseconds):
+        """Convert a duration to a whole number of frames"""
+        return int(round(milliseconds / 1000 * self.rate / self.frame_samples))
@@ -0,0 +1,161 @@
+"""
+Voice Timeline
+Per-turn stage timestamps and mouth-to-ear latency for voice conversations
+"""
+
+import time
+import threading
+from config.settings import VOICE_SETTINGS
+
+# Stages of one voice turn, in the order they happen
+STAGES = (
+    "speech_end",  # The user stopped talking
+    "end_detected",  # The VAD decided the utterance is over
+    "transcribed",  # The final transcript is ready
+    "first_token",  # The first chunk of the reply arrived from the LLM
+    "first_sentence",  # The first sentence went to speech synthesis
+    "audio_ready",  # Synthesized audio for it started arriving
+    "first_audio",  # Playback of the reply started
+)
+
+
+class TurnTimeline:
+    """Timestamps of one turn, from the user going quiet to the reply being heard"""
+
+    def __init__(self, budget_ms=None, stage_budgets_ms=None, on_complete=None):
+        """
+        Initialize the timeline
+
+        Args:
+            budget_ms (float): Target mouth-to-ear latency (defaults to VOICE_SETTINGS)
+            stage_budgets_ms (dict): Target time per stage, measured from the
+                previous stage (defaults to VOICE_SETTINGS)
+            on_complete (function): Called once with the report from finish()
+        """
+        self.budget_ms = budget_ms if budget_ms is not None else VOICE_SETTINGS["latency_budget_ms"]
+        self.stage_budgets_ms = stage_budgets_ms if stage_budgets_ms is not None else VOICE_SETTINGS["stage_budgets_ms"]
+        self.on_complete = on_complete
+
+        self.marks = {}
+        self.finished = False
+        self._lock = threading.Lock()
+
+    def mark(self, stage, at=None):
+        """
+        Record when a stage happened
+
+        Only the first mark of each stage counts, and a stage is ignored until
+        the one before it has been marked (so audio still playing from an
+        earlier turn cannot complete this one).
+
+        Args:
+            stage (str): One of STAGES
+            at (float): time.monotonic() timestamp (defaults to now)
+
+        Returns:
+            bool: Whether the mark was recorded
+        """
+        index = STAGES.index(stage)
+
+        with self._lock:
+            if self.finished or stage in self.marks:
+                return False
+            if index and STAGES[index - 1] not in self.marks:
+                return False
+
+            self.marks[stage] = time.monotonic() if at is None else at
+
+        if stage == STAGES[-1]:
+            self.finish()
+
+        return True
+
+    @property
+    def mouth_to_ear_ms(self):
+        """Milliseconds from the end of the user's speech to the start of the reply, if known"""
+        if "speech_end" not in self.marks or STAGES[-1] not in self.marks:
+            return None
+        return (self.marks[STAGES[-1]] - self.marks["speech_end"]) * 1000
+
+    def stage_durations(self):
+        """
+        Time spent in each stage
+
+        Returns:
+            dict: Stage name -> milliseconds since the previous stage
+        """
+        durations = {}
+
+        for previous, stage in zip(STAGES, STAGES[1:]):
+            if stage not in self.marks:
+                break
+            durations[stage] = (self.marks[stage] - self.marks[previous]) * 1000
+
+        return durations
+
+    def report(self):
+        """
+        Summarize the turn against its budgets
+
+        Returns:
+            dict: mouth_to_ear_ms, budget_ms, stages (durations) and
+                over_budget (stages, or "total", that missed their target)
+        """
+        durations = self.stage_durations()
+        mouth_to_ear = self.mouth_to_ear_ms
+
+        over_budget = [
+            stage for stage, duration in durations.items()
+            if stage in self.stage_budgets_ms and duration > self.stage_budgets_ms[stage]
+        ]
+        if mouth_to_ear is not None and mouth_to_ear > self.budget_ms:
+            over_budget.append("total")
+
+        return {
+            "mouth_to_ear_ms": mouth_to_ear,
+            "budget_ms": self.budget_ms,
+            "stages": durations,
+            "over_budget": over_budget,
+        }
+
+    def finish(self):
+        """
+        Close the timeline and hand its report to on_complete (once)
+
+        Returns:
+            dict: The report, or None if the timeline was already finished
+        """
+        with self._lock:
+            if self.finished:
+                return None
+            self.finished = True
+
+        report = self.report()
+
+        if self.on_complete:
+            self.on_complete(report)
+
+        return report
+
+
+def format_report(report):
+    """
+    Describe a turn report in one line
+
+    Args:
+        report (dict): Report from TurnTimeline.report()
+
+    Returns:
+        str: e.g. "mouth-to-ear 1840 ms (budget 2500 ms); transcribed 310 ms, ..."
+    """
+    if report["mouth_to_ear_ms"] is None:
+        summary = "mouth-to-ear unknown (no audio played)"
+    else:
+        summary = f"mouth-to-ear {report['mouth_to_ear_ms']:.0f} ms (budget {report['budget_ms']:.0f} ms)"
+
+    stages = ", ".join(
+        f"{stage} {duration:.0f} ms{'!' if stage in report['over_budget'] else ''}"
+        for stage, duration in report["stages"].items()
+    )
+
+    return f"{summary}; {stages}" if stages else summary
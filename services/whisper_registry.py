@@ -0,0 +1,206 @@
+"""
+Whisper Registry
+Process-wide Whisper models, loaded in the background and unloaded when idle
+"""
+
+import os
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from config.settings import WHISPER_SETTINGS
+from services.whisper_tuning import get_transcription_settings
+
+
+def load_whisper_model(model_size, device, compute_type, cpu_threads=0, num_workers=1):
+    """
+    Load a faster-whisper model, preferring the local model directory
+
+    Args:
+        model_size (str): Whisper model size
+        device (str): Device to run on
+        compute_type (str): CTranslate2 compute type
+        cpu_threads (int): CTranslate2 threads (0 uses its default)
+        num_workers (int): Transcriptions the model can run in parallel
+
+    Returns:
+        WhisperModel: The loaded model
+    """
+    # Imported here so the slow import does not delay startup
+    from faster_whisper import WhisperModel
+
+    options = {
+        "device": device,
+        "compute_type": compute_type,
+        "cpu_threads": cpu_threads,
+        "num_workers": num_workers,
+    }
+
+    # Only use the local model directory if it exists
+    model_path = WHISPER_SETTINGS["model_path"]
+    if os.path.exists(model_path):
+        options["download_root"] = model_path
+
+    return WhisperModel(model_size, **options)
+
+
+class WhisperRegistry:
+    """Registry that loads each Whisper model once and shares it between services"""
+
+    def __init__(self, idle_timeout=None):
+        """
+        Initialize the registry
+
+        Args:
+            idle_timeout (float): Seconds a model may sit unused before it is
+                unloaded (0 or None keeps models loaded)
+        """
+        self.idle_timeout = idle_timeout
+        self._futures = {}
+        self._active = {}
+        self._timers = {}
+        self._lock = threading.Lock()
+
+    def get_model_future(self, model_size=None, device=None, compute_type=None,
+                         cpu_threads=None, num_workers=None):
+        """
+        Get a future for a model, starting a background load if needed
+
+        Settings not given come from the tuned profile, or WHISPER_SETTINGS.
+
+        Args:
+            model_size (str): Whisper model size
+            device (str): Device to run on
+            compute_type (str): CTranslate2 compute type
+            cpu_threads (int): CTranslate2 threads
+            num_workers (int): Transcriptions the model can run in parallel
+
+        Returns:
+            concurrent.futures.Future: Future resolving to the loaded WhisperModel
+        """
+        key = self._make_key(model_size, device, compute_type, cpu_threads, num_workers)
+
+        with self._lock:
+            future = self._futures.get(key)
+
+            # Retry a load that failed earlier
+            if future is not None and future.done() and future.exception() is not None:
+                future = None
+
+            if future is None:
+                future = Future()
+                self._futures[key] = future
+
+                threading.Thread(
+                    target=self._load,
+                    args=(key, future),
+                    name=f"whisper-load-{key[0]}",
+                    daemon=True
+                ).start()
+
+        return future
+
+    def preload(self, model_size=None, device=None, compute_type=None):
+        """Start loading a model in the background without waiting for it"""
+        self.get_model_future(model_size, device, compute_type)
+
+    @contextmanager
+    def use(self, model_size=None, device=None, compute_type=None, timeout=None,
+            cpu_threads=None, num_workers=None):
+        """
+        Borrow a loaded model, waiting for it to finish loading if necessary
+
+        The model is not unloaded while it is borrowed.
+
+        Args:
+            model_size (str): Whisper model size
+            device (str): Device to run on
+            compute_type (str): CTranslate2 compute type
+            timeout (float): Seconds to wait for the model to load
+            cpu_threads (int): CTranslate2 threads
+            num_workers (int): Transcriptions the model can run in parallel
+
+        Yields:
+            WhisperModel: The loaded model
+        """
+        key = self._make_key(model_size, device, compute_type, cpu_threads, num_workers)
+
+        with self._lock:
+            self._active[key] = self._active.get(key, 0) + 1
+            timer = self._timers.pop(key, None)
+
+        if timer:
+            timer.cancel()
+
+        try:
+            yield self.get_model_future(*key).result(timeout)
+
+        finally:
+            with self._lock:
+                self._active[key] -= 1
+                self._start_idle_timer(key)
+
+    def _start_idle_timer(self, key):
+        """Unload a model after idle_timeout unless it is borrowed first (lock held)"""
+        if not self.idle_timeout or self._active.get(key, 0) > 0 or key in self._timers:
+            return
+
+        timer = threading.Timer(self.idle_timeout, self._unload_if_idle, args=(key,))
+        timer.daemon = True
+        self._timers[key] = timer
+        timer.start()
+
+    def _unload_if_idle(self, key):
+        """Unload a model if nobody borrowed it since the idle timer started"""
+        with self._lock:
+            if self._active.get(key, 0) > 0:
+                return
+            self._futures.pop(key, None)
+            self._timers.pop(key, None)
+
+    def _load(self, key, future):
+        """Load a model on a background thread and resolve its future"""
+        try:
+            model = load_whisper_model(*key)
+
+            # A preloaded model that is never used must not stay resident forever
+            with self._lock:
+                if self._futures.get(key) is future:
+                    self._start_idle_timer(key)
+
+            future.set_result(model)
+
+        except Exception as e:
+            print(f"Error loading Whisper model: {e}")
+            future.set_exception(e)
+
+    def _make_key(self, model_size, device, compute_type, cpu_threads=None, num_workers=None):
+        """Build a registry key, filling in defaults from the transcription settings"""
+        defaults = get_transcription_settings()
+
+        return (
+            model_size or defaults["model_size"],
+            device or defaults["device"],
+            compute_type or defaults["compute_type"],
+            defaults["cpu_threads"] if cpu_threads is None else cpu_threads,
+            defaults["num_workers"] if num_workers is None else num_workers
+        )
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+def get_whisper_registry():
+    """
+    Get the process-wide Whisper registry
+
+    Returns:
+        WhisperRegistry: Shared registry instance
+    """
+    global _registry
+
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = WhisperRegistry(WHISPER_SETTINGS["idle_unload_timeout"])
+
+    return _registry
@@ -0,0 +1,343 @@
+"""
+Whisper Tuning
+Benchmarks faster-whisper settings on reference clips and keeps the fastest accurate profile
+"""
+
+import os
+import re
+import json
+import time
+import wave
+import threading
+import numpy as np
+from datetime import datetime
+from config.settings import WHISPER_SETTINGS, WHISPER_CALIBRATION_SETTINGS
+
+# Settings a tuned profile may override
+TUNED_KEYS = ("compute_type", "cpu_threads", "num_workers", "beam_size")
+
+
+def normalize_words(text):
+    """Lowercase words without punctuation, for scoring transcripts"""
+    return re.findall(r"[a-z0-9']+", text.lower())
+
+
+def word_error_rate(reference, hypothesis):
+    """
+    Word error rate of a transcript
+
+    Args:
+        reference (str): Correct transcript
+        hypothesis (str): Transcript to score
+
+    Returns:
+        float: (substitutions + deletions + insertions) / reference words
+    """
+    ref = normalize_words(reference)
+    hyp = normalize_words(hypothesis)
+
+    if not ref:
+        return 0.0 if not hyp else 1.0
+
+    # Edit distance over words, one row at a time
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hyp, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ref_word != hyp_word)
+            ))
+        previous = current
+
+    return previous[-1] / len(ref)
+
+
+def load_calibration_clips(clips_dir=None):
+    """
+    Load the reference clips used for calibration
+
+    Each clip is a 16 kHz mono 16-bit WAV file with a .txt file of the same
+    name holding its correct transcript.
+
+    Args:
+        clips_dir (str): Directory of clips (defaults to WHISPER_CALIBRATION_SETTINGS)
+
+    Returns:
+        list: (name, float32 samples, reference text) tuples
+    """
+    clips_dir = clips_dir or WHISPER_CALIBRATION_SETTINGS["clips_dir"]
+    clips = []
+
+    if not os.path.isdir(clips_dir):
+        return clips
+
+    for filename in sorted(os.listdir(clips_dir)):
+        if not filename.endswith(".wav"):
+            continue
+
+        name = filename[:-4]
+        transcript_path = os.path.join(clips_dir, f"{name}.txt")
+        if not os.path.exists(transcript_path):
+            continue
+
+        with wave.open(os.path.join(clips_dir, filename), 'rb') as wf:
+            if wf.getframerate() != 16000 or wf.getnchannels() != 1 or wf.getsampwidth() != 2:
+                print(f"Skipping calibration clip {filename}: expected 16 kHz mono 16-bit audio")
+                continue
+            pcm = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+
+        with open(transcript_path, 'r') as f:
+            reference = f.read().strip()
+
+        clips.append((name, np.multiply(pcm, 1.0 / 32768.0, dtype=np.float32), reference))
+
+    return clips
+
+
+def benchmark_model(model, clips, beam_size):
+    """
+    Transcribe every clip once with one model and beam size
+
+    Args:
+        model (WhisperModel): Loaded model
+        clips (list): Clips from load_calibration_clips
+        beam_size (int): Beam size to transcribe with
+
+    Returns:
+        tuple: (seconds spent transcribing, mean word error rate)
+    """
+    elapsed = 0.0
+    errors = []
+
+    for _, audio, reference in clips:
+        started = time.perf_counter()
+        segments, _ = model.transcribe(audio, beam_size=beam_size)
+        text = " ".join(segment.text for segment in segments)
+        elapsed += time.perf_counter() - started
+
+        errors.append(word_error_rate(reference, text))
+
+    return elapsed, sum(errors) / len(errors)
+
+
+def calibrate(clips=None, model_size=None, device=None, settings=None, log=print):
+    """
+    Find the fastest settings whose accuracy stays within tolerance
+
+    Every compute type and thread count is loaded once and tried with each
+    beam size. The float32, beam 5 run is the accuracy reference.
+
+    Args:
+        clips (list): Clips from load_calibration_clips (loaded if omitted)
+        model_size (str): Whisper model size (defaults to WHISPER_SETTINGS)
+        device (str): Device to run on (defaults to WHISPER_SETTINGS)
+        settings (dict): Overrides for WHISPER_CALIBRATION_SETTINGS
+        log (function): Receives progress messages
+
+    Returns:
+        dict: The chosen profile (also saved), or None if there are no clips
+    """
+    # Imported here to avoid a circular import (the registry reads profiles)
+    from services.whisper_registry import load_whisper_model
+
+    settings = dict(WHISPER_CALIBRATION_SETTINGS, **(settings or {}))
+    model_size = model_size or WHISPER_SETTINGS["model_size"]
+    device = device or WHISPER_SETTINGS["device"]
+    clips = clips if clips is not None else load_calibration_clips(settings["clips_dir"])
+
+    if not clips:
+        log(f"No calibration clips in {settings['clips_dir']}; keeping default Whisper settings")
+        return None
+
+    audio_seconds = sum(len(audio) for _, audio, _ in clips) / 16000
+    thread_counts = [n for n in settings["cpu_threads"] if n <= (os.cpu_count() or 1)] or [0]
+    results = []
+
+    for compute_type in settings["compute_types"]:
+        for cpu_threads in thread_counts:
+            try:
+                model = load_whisper_model(model_size, device, compute_type, cpu_threads)
+            except ValueError as e:
+                # Compute type not supported on this machine
+                log(f"Skipping {compute_type}: {e}")
+                break
+
+            # Warm up so one-off setup is not billed to the first beam size
+            benchmark_model(model, clips[:1], 1)
+
+            for beam_size in settings["beam_sizes"]:
+                elapsed, wer = benchmark_model(model, clips, beam_size)
+                results.append({
+                    "compute_type": compute_type,
+                    "cpu_threads": cpu_threads,
+                    "beam_size": beam_size,
+                    "wer": round(wer, 4),
+                    "realtime_factor": round(elapsed / audio_seconds, 4),
+                })
+                log(f"{compute_type:>13} threads={cpu_threads} beam={beam_size}: "
+                    f"WER {wer:.3f}, {elapsed / audio_seconds:.3f}x real time")
+
+            del model
+
+    profile = choose_profile(results, settings["wer_tolerance"])
+    if profile is None:
+        log("No Whisper configuration could be benchmarked; keeping default settings")
+        return None
+
+    profile.update({
+        "model_size": model_size,
+        "device": device,
+        "num_workers": WHISPER_SETTINGS["num_workers"],
+        "clips": len(clips),
+        "calibrated_at": datetime.now().isoformat(),
+    })
+    save_profile(profile)
+    log(f"Tuned Whisper profile: {profile['compute_type']}, {profile['cpu_threads']} threads, "
+        f"beam {profile['beam_size']} (WER {profile['wer']:.3f})")
+
+    return profile
+
+
+def choose_profile(results, wer_tolerance):
+    """
+    Pick the fastest result that is accurate enough
+
+    Args:
+        results (list): Dicts with compute_type, cpu_threads, beam_size, wer
+            and realtime_factor
+        wer_tolerance (float): Allowed word error rate above the reference
+
+    Returns:
+        dict: Copy of the chosen result, or None if there are no results
+    """
+    if not results:
+        return None
+
+    reference = [r for r in results if r["compute_type"] == "float32" and r["beam_size"] == 5]
+    reference_wer = min(r["wer"] for r in (reference or results))
+
+    accurate = [r for r in results if r["wer"] <= reference_wer + wer_tolerance]
+    best = min(accurate, key=lambda r: (r["realtime_factor"], r["wer"]))
+
+    return dict(best, reference_wer=reference_wer)
+
+
+def load_profile(path=None):
+    """
+    Read the saved profile if it was tuned for the configured model and device
+
+    Args:
+        path (str): Profile file (defaults to WHISPER_SETTINGS)
+
+    Returns:
+        dict: The profile, or None
+    """
+    path = path or WHISPER_SETTINGS["profile_path"]
+
+    try:
+        with open(path, 'r') as f:
+            profile = json.load(f)
+    except (json.JSONDecodeError, FileNotFoundError):
+        return None
+
+    # A profile for another model or device says nothing about this one
+    if (profile.get("model_size") != WHISPER_SETTINGS["model_size"]
+            or profile.get("device") != WHISPER_SETTINGS["device"]):
+        return None
+
+    return profile
+
+
+def save_profile(profile, path=None):
+    """Persist a tuned profile"""
+    path = path or WHISPER_SETTINGS["profile_path"]
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    with open(path, 'w') as f:
+        json.dump(profile, f, indent=2)
+
+    _reset_transcription_settings()
+
+
+_transcription_settings = None
+_settings_lock = threading.Lock()
+_calibration_thread = None
+
+def get_transcription_settings():
+    """
+    Get the Whisper settings to transcribe with
+
+    Returns:
+        dict: model_size, device, compute_type, cpu_threads, num_workers and
+            beam_size, from the tuned profile where one exists
+    """
+    global _transcription_settings
+
+    if _transcription_settings is None:
+        with _settings_lock:
+            if _transcription_settings is None:
+                settings = {
+                    key: WHISPER_SETTINGS[key]
+                    for key in ("model_size", "device") + TUNED_KEYS
+                }
+
+                profile = load_profile() if WHISPER_SETTINGS["use_tuned_profile"] else None
+                if profile:
+                    settings.update({key: profile[key] for key in TUNED_KEYS if key in profile})
+
+                _transcription_settings = settings
+
+    return _transcription_settings
+
+
+def _reset_transcription_settings():
+    """Make the next get_transcription_settings() call re-read the profile"""
+    global _transcription_settings
+
+    with _settings_lock:
+        _transcription_settings = None
+
+
+def ensure_calibrated():
+    """
+    Start a background calibration on first run
+
+    Does nothing if a profile already exists, tuning is disabled, there are no
+    clips, or a calibration is already running. Transcriptions keep using the
+    default settings until it finishes.
+    """
+    global _calibration_thread
+
+    if (not WHISPER_SETTINGS["use_tuned_profile"]
+            or not WHISPER_CALIBRATION_SETTINGS["run_on_first_start"]
+            or load_profile() is not None):
+        return
+
+    clips_dir = WHISPER_CALIBRATION_SETTINGS["clips_dir"]
+    if not os.path.isdir(clips_dir) or not any(f.endswith(".wav") for f in os.listdir(clips_dir)):
+        return
+
+    with _settings_lock:
+        if _calibration_thread is not None:
+            return
+
+        _calibration_thread = threading.Thread(
+            target=_calibrate_in_background,
+            name="whisper-calibrate",
+            daemon=True
+        )
+        _calibration_thread.start()
+
+
+def _calibrate_in_background():
+    """Run calibrate() on a background thread, reporting rather than raising errors"""
+    from services.whisper_registry import get_whisper_registry
+
+    try:
+        if calibrate():
+            # Have the tuned model ready before the next transcription needs it
+            get_whisper_registry().preload()
+    except Exception as e:
+        print(f"Error calibrating Whisper: {str(e)}")
@@ -0,0 +1,69 @@
+"""
+LLM Cassette tests
+Recording through hedged streams must only keep the responses that were used
+"""
+
+import asyncio
+from services.llm_backends import LLMBackend
+from services.llm_cassette import Cassette, RecordingBackend, ReplayBackend
+from services.llm_resilience import hedged_stream
+
+
+class SlowFirstBackend(LLMBackend):
+    """Backend whose first request stalls, so a hedge always wins"""
+
+    name = "test"
+
+    def __init__(self):
+        self.calls = 0
+
+    def is_configured(self):
+        return True
+
+    async def stream(self, prompt, generation_config):
+        self.calls += 1
+        if self.calls == 1:
+            await asyncio.sleep(1.0)
+
+        for chunk in ("Hello", " there"):
+            yield chunk
+
+
+def test_hedged_stream_records_only_the_winner(tmp_path):
+    cassette = Cassette(str(tmp_path / "cassette.json"))
+    backend = RecordingBackend(SlowFirstBackend(), cassette)
+
+    async def run():
+        chunks = hedged_stream(lambda: backend.stream("prompt", {}), hedge_after=0.05)
+        return "".join([chunk async for chunk in chunks])
+
+    assert asyncio.run(run()) == "Hello there"
+
+    # The stalled primary was cancelled, so it must not be saved as an empty response
+    assert len(cassette.interactions) == 1
+    assert [chunk for _, chunk in cassette.interactions[0]["chunks"]] == ["Hello", " there"]
+    assert cassette.interactions[0]["error"] is None
+
+    replay = Cassette(cassette.path)
+    replay.load()
+
+    async def replay_run():
+        chunks = ReplayBackend(replay, realtime=False).stream("prompt", {})
+        return "".join([chunk async for chunk in chunks])
+
+    assert asyncio.run(replay_run()) == "Hello there"
+
+
+def test_closed_stream_is_not_recorded(tmp_path):
+    cassette = Cassette(str(tmp_path / "cassette.json"))
+    backend = RecordingBackend(SlowFirstBackend(), cassette)
+    backend.backend.calls = 1  # Skip the stall
+
+    async def run():
+        chunks = backend.stream("prompt", {})
+        first = await chunks.__anext__()
+        await chunks.aclose()
+        return first
+
+    assert asyncio.run(run()) == "Hello"
+    assert cassette.interactions == []
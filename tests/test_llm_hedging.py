@@ -0,0 +1,83 @@
+"""
+LLM hedging tests
+A hedged duplicate is a real API call and must go through the scheduler
+"""
+
+import asyncio
+from config.settings import LLM_SETTINGS
+from services.llm_backends import LLMBackend
+from services.llm_scheduler import LLMScheduler
+from services.llm_service import LLMService
+from services.metrics import MetricsRegistry
+
+
+class SlowFirstBackend(LLMBackend):
+    """Backend whose first request stalls, so a hedge always wins"""
+
+    name = "test"
+
+    def __init__(self, stall=1.0):
+        self.stall = stall
+        self.calls = 0
+
+    def is_configured(self):
+        return True
+
+    async def stream(self, prompt, generation_config):
+        self.calls += 1
+        if self.calls == 1:
+            await asyncio.sleep(self.stall)
+
+        for chunk in ("Hello", " there"):
+            yield chunk
+
+
+def make_service(monkeypatch, backend, max_concurrency):
+    # Offline backend, so no Gemini client is created
+    monkeypatch.setitem(LLM_SETTINGS, "backend", "stub")
+
+    service = LLMService()
+    service.backend = backend
+    service.metrics = MetricsRegistry()
+    service.scheduler = LLMScheduler(
+        {"interactive": {"priority": 0, "max_concurrency": max_concurrency}},
+        requests_per_minute=600,
+        burst=10,
+        metrics=service.metrics
+    )
+    service._get_hedge_delay = lambda: 0.05
+    return service
+
+
+def test_hedge_takes_its_own_slot(monkeypatch):
+    backend = SlowFirstBackend()
+    service = make_service(monkeypatch, backend, max_concurrency=2)
+    active = []
+
+    async def run():
+        chunks = []
+        async for chunk in service._stream_model("prompt", {}):
+            active.append(service.scheduler._active["interactive"])
+            chunks.append(chunk)
+        return "".join(chunks)
+
+    assert asyncio.run(run()) == "Hello there"
+    assert backend.calls == 2
+
+    # Both calls held a slot and a token; the losing primary gave its slot back
+    assert active[0] == 2
+    assert service.scheduler._active["interactive"] == 0
+    assert service.scheduler._tokens < 9
+
+
+def test_hedge_is_skipped_without_a_free_slot(monkeypatch):
+    backend = SlowFirstBackend(stall=0.2)
+    service = make_service(monkeypatch, backend, max_concurrency=1)
+
+    async def run():
+        return "".join([chunk async for chunk in service._stream_model("prompt", {})])
+
+    assert asyncio.run(run()) == "Hello there"
+    assert backend.calls == 1
+    assert service.metrics.percentile("llm.hedge_skipped", 100, {"caller": "llm"}) == 1
+    assert service.scheduler._active["interactive"] == 0
@@ -0,0 +1,66 @@
+"""
+Single Flight tests
+An upstream call must stop once every subscriber has gone
+"""
+
+import asyncio
+from services.single_flight import SingleFlight
+
+
+def make_upstream(started, cancelled):
+    """Upstream factory that stalls after its first chunk until cancelled"""
+    async def upstream():
+        started.set()
+        try:
+            yield "first"
+            await asyncio.sleep(10)
+            yield "never"
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    return upstream
+
+
+def test_upstream_is_cancelled_when_last_subscriber_leaves():
+    async def run():
+        group = SingleFlight()
+        started, cancelled = asyncio.Event(), asyncio.Event()
+
+        first = group.stream("key", make_upstream(started, cancelled))
+        second = group.stream("key", make_upstream(started, cancelled))
+        assert await first.__anext__() == "first"
+        assert await second.__anext__() == "first"
+
+        # One subscriber leaving keeps the upstream going for the other
+        await first.aclose()
+        await asyncio.sleep(0)
+        assert not cancelled.is_set()
+
+        await second.aclose()
+        await asyncio.wait_for(cancelled.wait(), 1)
+
+        # A later identical request starts a fresh upstream call
+        assert "key" not in group._flights
+
+    asyncio.run(run())
+
+
+def test_upstream_is_cancelled_when_subscriber_times_out():
+    async def run():
+        group = SingleFlight()
+        started, cancelled = asyncio.Event(), asyncio.Event()
+
+        async def consume():
+            async for _ in group.stream("key", make_upstream(started, cancelled)):
+                pass
+
+        try:
+            await asyncio.wait_for(consume(), 0.1)
+        except asyncio.TimeoutError:
+            pass
+
+        await asyncio.wait_for(cancelled.wait(), 1)
+        assert "key" not in group._flights
+
+    asyncio.run(run())
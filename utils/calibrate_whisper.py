@@ -0,0 +1,18 @@
+"""
+Whisper Calibration
+Re-runs the faster-whisper benchmark and saves the tuned profile
+
+Put 16 kHz mono WAV clips with matching .txt transcripts in
+WHISPER_CALIBRATION_SETTINGS["clips_dir"], then run:
+
+    python -m utils.calibrate_whisper
+"""
+
+from config.settings import WHISPER_SETTINGS
+from services.whisper_tuning import calibrate
+
+
+if __name__ == "__main__":
+    profile = calibrate()
+    if profile:
+        print(f"Saved to {WHISPER_SETTINGS['profile_path']}")
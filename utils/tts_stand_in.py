@@ -0,0 +1,115 @@
+"""
+TTS Stand-in
+Local HTTP server imitating the Elevenlabs streaming endpoint
+
+Serves fake audio in slow chunks so streaming playback can be checked
+without an API key. Run with:
+
+    python -m utils.tts_stand_in
+
+and point TTS_SETTINGS["api_base_url"] at the printed URL, or run the
+built-in check, which compares time to first chunk with download time:
+
+    python -m utils.tts_stand_in --check
+"""
+
+import sys
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from services.tts_client import TTSClient
+
+CHUNK_BYTES = 4096
+CHUNK_DELAY = 0.1  # Seconds between chunks, roughly real-time MP3 at 320 kbps
+BYTES_PER_CHAR = 800  # Fake audio length per character of text
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Answers POST /text-to-speech/<voice>/stream with chunked fake audio"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+
+        if not self.path.endswith("/stream") or not self.headers.get("xi-api-key"):
+            self.send_response(401)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        remaining = max(CHUNK_BYTES, len(body.get("text", "")) * BYTES_PER_CHAR)
+
+        self.send_response(200)
+        self.send_header("Content-Type", "audio/mpeg")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        # Frame-sync bytes so real decoders at least recognize the stream
+        while remaining > 0:
+            size = min(CHUNK_BYTES, remaining)
+            chunk = b"\xff\xfb" + bytes(size - 2)
+            self.wfile.write(f"{size:x}\r\n".encode() + chunk + b"\r\n")
+            self.wfile.flush()
+            remaining -= size
+            time.sleep(CHUNK_DELAY)
+
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(port=0):
+    """
+    Start the stand-in on a background thread
+
+    Args:
+        port (int): Port to listen on (0 picks a free one)
+
+    Returns:
+        tuple: (server, base URL to use as api_base_url)
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", port), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+
+def check():
+    """Stream a sentence from the stand-in and print when audio becomes available"""
+    server, base_url = start_server()
+    client = TTSClient(base_url)
+
+    text = "Please take one tablet twice a day with food."
+    voice_settings = {"stability": 0.5, "similarity_boost": 0.5}
+
+    for attempt in range(2):
+        started = time.perf_counter()
+        audio = client.stream(text, "stand-in", "voice", "model", voice_settings)
+
+        first_chunk = None
+        total = 0
+        for chunk in audio:
+            if first_chunk is None:
+                first_chunk = time.perf_counter() - started
+            total += len(chunk)
+
+        elapsed = time.perf_counter() - started
+        print(f"request {attempt + 1}: first audio after {first_chunk * 1000:.0f} ms, "
+              f"{total} bytes after {elapsed * 1000:.0f} ms")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    if "--check" in sys.argv:
+        check()
+    else:
+        server, base_url = start_server(8765)
+        print(f"TTS stand-in listening, api_base_url = {base_url}")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            server.shutdown()
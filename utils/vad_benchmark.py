@@ -0,0 +1,117 @@
+"""
+VAD Benchmark
+Measures end-of-speech detection delay on synthetic audio
+
+Compares the callback-driven VoiceActivityDetector with the old
+poll-every-100ms silence check. Run with:
+
+    python -m utils.vad_benchmark
+"""
+
+import numpy as np
+from config.settings import AUDIO_SETTINGS, VAD_SETTINGS
+from services.vad import VoiceActivityDetector
+
+RATE = AUDIO_SETTINGS["rate"]
+CHUNK = AUDIO_SETTINGS["chunk"]
+
+
+def make_utterance(noise_rms, speech_rms, lead_in=1.0, speech=2.0, tail=4.0, seed=0):
+    """
+    Build a synthetic recording: background noise, a spoken burst, then noise again
+
+    The "speech" is a mix of voiced harmonics with a 4 Hz syllable envelope.
+
+    Returns:
+        tuple: (int16 samples, sample index where speech ends)
+    """
+    rng = np.random.default_rng(seed)
+    total = int((lead_in + speech + tail) * RATE)
+    audio = rng.normal(0, noise_rms, total)
+
+    start = int(lead_in * RATE)
+    end = start + int(speech * RATE)
+    t = np.arange(end - start) / RATE
+
+    voiced = sum(np.sin(2 * np.pi * f * t) / k for k, f in enumerate((140, 280, 420, 560), 1))
+    envelope = 0.6 + 0.4 * np.abs(np.sin(2 * np.pi * 4 * t))
+    voiced *= envelope
+    voiced *= speech_rms / np.sqrt(np.mean(voiced ** 2))
+    audio[start:end] += voiced
+
+    return np.clip(audio, -32768, 32767).astype(np.int16), end
+
+
+def detect_with_vad(audio):
+    """Sample offset at which the callback-driven detector signals end of speech"""
+    vad = VoiceActivityDetector(RATE)
+
+    # Feed blocks the way the PyAudio callback delivers them
+    for offset in range(0, len(audio), CHUNK):
+        vad.process(audio[offset:offset + CHUNK])
+        if vad.speech_ended.is_set():
+            # The event fires when the block containing the frame arrives
+            return min(offset + CHUNK, len(audio)), vad.speech_detected
+
+    return None, vad.speech_detected
+
+
+def detect_with_polling(audio, poll_phase=0.05):
+    """Sample offset at which the old 100 ms polling loop would stop recording"""
+    threshold = AUDIO_SETTINGS["silence_threshold"]
+    chunks_per_check = int(RATE / CHUNK * 0.1)
+    silence_limit = int(AUDIO_SETTINGS["silence_duration"] * RATE / CHUNK)
+    min_chunks = int(1.0 * RATE / CHUNK)
+
+    consecutive_silence = 0
+    check_time = poll_phase
+
+    while check_time * RATE < len(audio):
+        captured_chunks = int(check_time * RATE) // CHUNK
+
+        if captured_chunks >= max(chunks_per_check, min_chunks):
+            tail = audio[(captured_chunks - chunks_per_check) * CHUNK:captured_chunks * CHUNK]
+            if np.abs(tail.astype(np.int32)).mean() < threshold:
+                consecutive_silence += 1
+                if consecutive_silence >= silence_limit:
+                    return int(check_time * RATE)
+            else:
+                consecutive_silence = 0
+
+        check_time += 0.1
+
+    return None
+
+
+def run(trials=20):
+    """Run the benchmark and print a summary"""
+    print(f"Hangover: {VAD_SETTINGS['hangover_ms']:.0f} ms, block: {CHUNK / RATE * 1000:.0f} ms")
+    print(f"{'noise rms':>10} {'speech rms':>11} {'vad p50':>9} {'vad max':>9} {'poll p50':>9} {'poll max':>9}")
+
+    for noise_rms, speech_rms in ((30, 3000), (150, 3000), (400, 4000)):
+        vad_delays = []
+        poll_delays = []
+
+        for trial in range(trials):
+            audio, speech_end = make_utterance(noise_rms, speech_rms, seed=trial)
+
+            detected, _ = detect_with_vad(audio)
+            if detected is not None:
+                vad_delays.append((detected - speech_end) / RATE * 1000)
+
+            detected = detect_with_polling(audio, poll_phase=(trial % 10) / 100)
+            if detected is not None:
+                poll_delays.append((detected - speech_end) / RATE * 1000)
+
+        def fmt(delays, stat):
+            return f"{stat(delays):8.0f}ms" if delays else "   missed"
+
+        print(
+            f"{noise_rms:>10} {speech_rms:>11} "
+            f"{fmt(vad_delays, np.median)} {fmt(vad_delays, np.max)} "
+            f"{fmt(poll_delays, np.median)} {fmt(poll_delays, np.max)}"
+        )
+
+
+if __name__ == "__main__":
+    run()
@@ -15,6 +15,7 @@ from config.settings import get_user_dir, CREDENTIALS_FILE
 from controllers.chat_controller import ChatController
 from controllers.document_controller import DocumentController
 from services.speech_service import SpeechService
+from services.long_recording import LongRecording
 from services.message_service import MessageService
 
 class ChatPanel(ttk.LabelFrame):
@@ -27,6 +28,7 @@ class ChatPanel(ttk.LabelFrame):
         self.speech_service = speech_service
         self.message_queue = message_queue
         self.is_recording = False
+        self.visit_recording = None
         
         self.setup_ui()
     
@@ -59,6 +61,12 @@ class ChatPanel(ttk.LabelFrame):
             command=self.toggle_speech_input
         )
         
+        self.record_visit_button = ttk.Button(
+            self.input_frame,
+            text="Record Visit",
+            command=self.toggle_visit_recording
+        )
+        
         # Layout
         self.chat_display.pack(side=tk.TOP, fill=tk.BOTH, expand=True, padx=5, pady=5)
         chat_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
@@ -67,6 +75,7 @@ class ChatPanel(ttk.LabelFrame):
         self.message_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
         self.send_button.pack(side=tk.LEFT, padx=5)
         self.speak_button.pack(side=tk.LEFT, padx=5)
+        self.record_visit_button.pack(side=tk.LEFT, padx=5)
         
         # Add welcome message
         self.add_system_message("Welcome to GuideAI Doctor Assistant. How can I help you today?")
@@ -118,6 +127,52 @@ class ChatPanel(ttk.LabelFrame):
         self.speak_button.configure(text="🎤")
         self.speech_service.stop_recording()
     
+    def toggle_visit_recording(self):
+        """Start or stop recording a whole consultation"""
+        if self.visit_recording:
+            self.stop_visit_recording()
+        else:
+            self.start_visit_recording()
+    
+    def start_visit_recording(self):
+        """Start a long-form consultation recording"""
+        conversations_dir = os.path.join(self.chat_controller.user_dir, "conversations")
+        
+        try:
+            self.visit_recording = LongRecording(self.speech_service, conversations_dir)
+            self.visit_recording.start()
+        except Exception as e:
+            self.visit_recording = None
+            self.add_system_message(f"Could not start recording: {str(e)}")
+            return
+        
+        self.record_visit_button.configure(text="Stop Visit")
+        self.add_system_message("Recording consultation. The transcript is built in the background.")
+    
+    def stop_visit_recording(self):
+        """Stop the consultation recording and save its transcript"""
+        recording = self.visit_recording
+        self.visit_recording = None
+        self.record_visit_button.configure(text="Record Visit", state=tk.DISABLED)
+        self.add_system_message("Finishing consultation transcript...")
+        
+        # The last window is transcribed off the UI thread
+        threading.Thread(
+            target=self._finish_visit_recording,
+            args=(recording,),
+            daemon=True
+        ).start()
+    
+    def _finish_visit_recording(self, recording):
+        """Wait for the transcript in a background thread"""
+        try:
+            transcript_path = recording.stop()
+            self.message_queue.put(("chat", "add_message", ("system", f"Consultation transcript saved to {transcript_path}")))
+        except Exception as e:
+            self.message_queue.put(("chat", "add_message", ("system", f"Error saving consultation transcript: {str(e)}")))
+        finally:
+            self.message_queue.put(("ui", "reset_record_visit_button", None))
+    
     def record_audio(self):
         """Record audio and process speech input"""
         try:
@@ -150,9 +205,9 @@ class ChatPanel(ttk.LabelFrame):
     
     def handle_response_chunk(self, text_chunk):
         """Handle a chunk of streaming response"""
-        if text_chunk:
-            # This is called from a background thread, so we need to use the message queue
-            self.message_queue.put(("chat", "add_response_chunk", text_chunk))
+        # The chat controller already sends coalesced display updates through the
+        # message queue, so there is nothing more to do per chunk here
+        pass
     
     def add_message(self, sender, message):
         """Add a message to the chat display"""
@@ -1303,6 +1358,8 @@ class DoctorView(ttk.Frame):
                 elif target == "ui":
                     if action == "reset_speak_button":
                         self.chat_panel.speak_button.configure(text="🎤")
+                    elif action == "reset_record_visit_button":
+                        self.chat_panel.record_visit_button.configure(state=tk.NORMAL)
                 
                 self.message_queue.task_done()
         except queue.Empty:
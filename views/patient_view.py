@@ -11,12 +11,15 @@ import threading
 import queue
 import json
 
-from config.settings import get_user_dir, CREDENTIALS_FILE
+from config.settings import get_user_dir, CREDENTIALS_FILE, LLM_RESILIENCE_SETTINGS, UI_SETTINGS
 from controllers.chat_controller import ChatController
 from controllers.document_controller import DocumentController
 from services.speech_service import SpeechService
 from services.message_service import MessageService
+from services.event_loop import get_event_loop_thread
+from services.llm_resilience import Deadline
 from agents.specialist_agent import SpecialistAgent
+from controllers.voice_controller import VoiceController
 
 class ChatPanel(ttk.LabelFrame):
     """Chat panel UI component"""
@@ -28,6 +31,10 @@ class ChatPanel(ttk.LabelFrame):
         self.speech_service = speech_service
         self.message_queue = message_queue
         self.is_recording = False
+        self.streaming_response = False
+        
+        # Hands-free conversation, created when voice mode is first switched on
+        self.voice_controller = None
         
         self.setup_ui()
     
@@ -60,6 +67,12 @@ class ChatPanel(ttk.LabelFrame):
             command=self.toggle_speech_input
         )
         
+        self.voice_button = ttk.Button(
+            self.input_frame,
+            text="Voice Mode",
+            command=self.toggle_voice_mode
+        )
+        
         self.tts_var = tk.BooleanVar(value=True)
         self.tts_checkbox = ttk.Checkbutton(
             self.input_frame,
@@ -75,6 +88,7 @@ class ChatPanel(ttk.LabelFrame):
         self.message_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
         self.send_button.pack(side=tk.LEFT, padx=5)
         self.speak_button.pack(side=tk.LEFT, padx=5)
+        self.voice_button.pack(side=tk.LEFT, padx=5)
         self.tts_checkbox.pack(side=tk.RIGHT, padx=5)
         
         # Add welcome message
@@ -97,6 +111,7 @@ class ChatPanel(ttk.LabelFrame):
         
         # Get response from LLM
         self.add_system_message("Thinking...")
+        self.speech_service.begin_speaking()
         self.chat_controller.process_message(
             message,
             callback=self.handle_response_chunk
@@ -127,11 +142,40 @@ class ChatPanel(ttk.LabelFrame):
         self.speak_button.configure(text="🎤")
         self.speech_service.stop_recording()
     
+    def toggle_voice_mode(self):
+        """Switch hands-free voice conversation on/off"""
+        if self.voice_controller and self.voice_controller.running:
+            self.voice_controller.stop()
+            self.voice_button.configure(text="Voice Mode")
+            self.speak_button.configure(state=tk.NORMAL)
+            self.add_system_message("Voice mode off.")
+            return
+        
+        if self.is_recording:
+            self.stop_recording()
+        
+        if self.voice_controller is None:
+            self.voice_controller = VoiceController(
+                self.chat_controller,
+                self.speech_service,
+                partial_callback=self.handle_partial_transcript
+            )
+        
+        if not self.voice_controller.start():
+            self.add_system_message("Voice mode is still finishing the last turn. Please try again in a moment.")
+            return
+        
+        self.voice_button.configure(text="End Voice Mode")
+        self.speak_button.configure(state=tk.DISABLED)
+        self.add_system_message("Voice mode on. Speak whenever you're ready.")
+    
     def record_audio(self):
         """Record audio and process speech input"""
         try:
-            # Use speech service to record and transcribe
-            transcript = self.speech_service.record_and_transcribe()
+            # Use speech service to record and transcribe, showing partial text as it arrives
+            transcript = self.speech_service.record_and_transcribe(
+                partial_callback=self.handle_partial_transcript
+            )
             
             if transcript:
                 # Add transcript to chat
@@ -142,6 +186,7 @@ class ChatPanel(ttk.LabelFrame):
                 
                 # Get AI response
                 self.message_queue.put(("chat", "add_message", ("system", "Thinking...")))
+                self.speech_service.begin_speaking()
                 self.chat_controller.process_message(
                     transcript,
                     callback=self.handle_response_chunk
@@ -156,40 +201,63 @@ class ChatPanel(ttk.LabelFrame):
             # Reset recording state
             self.is_recording = False
             self.message_queue.put(("ui", "reset_speak_button", None))
+    
+    def handle_partial_transcript(self, text, is_final):
+        """Show the transcript so far in the input box (called from a worker thread)"""
+        # The final transcript is sent as a message, so the input is cleared
+        self.message_queue.put(("chat", "set_input_text", "" if is_final else text))
+    
+    def set_input_text(self, text):
+        """Replace the contents of the message input"""
+        self.message_entry.delete(0, tk.END)
+        self.message_entry.insert(0, text)
+    
     def add_response_chunk(self, text_chunk):
         """Add a chunk of response text to the display"""
-        self.chat_display.config(state=tk.NORMAL)
+        if not self.streaming_response:
+            # First chunk - clear any "Thinking..." messages and add the header
+            self.clear_system_messages()
+            self.chat_display.config(state=tk.NORMAL)
+            
+            timestamp = datetime.now().strftime("%H:%M:%S")
+            self.chat_display.insert(tk.END, f"[{timestamp}] AI Assistant: ", "assistant")
+            
+            # Remember where the response ends; right gravity keeps the mark after new text
+            self.chat_display.mark_set("response_end", "end-1c")
+            self.chat_display.mark_gravity("response_end", tk.RIGHT)
+            self.streaming_response = True
+        else:
+            self.chat_display.config(state=tk.NORMAL)
         
-        # Clear any "Thinking..." messages first
-        self.clear_system_messages()
+        # Append at the mark without re-reading the widget
+        self.chat_display.insert("response_end", text_chunk, "assistant")
         
-        # Check if we already have a message from the assistant
-        content = self.chat_display.get("1.0", tk.END)
-        timestamp = datetime.now().strftime("%H:%M:%S")
+        self.chat_display.see(tk.END)
+        self.chat_display.config(state=tk.DISABLED)
+    
+    def end_response(self):
+        """Finish the streamed response currently being displayed"""
+        if not self.streaming_response:
+            return
         
-        if "AI Assistant:" not in content:
-            # First chunk - add with timestamp
-            self.chat_display.insert(tk.END, f"[{timestamp}] AI Assistant: {text_chunk}", "assistant")
-        else:
-            # Append to existing message
-            # Find the last occurrence of "AI Assistant:"
-            last_pos = content.rfind("AI Assistant:")
-            if last_pos != -1:
-                # Insert at the end of the message
-                self.chat_display.insert(tk.END, text_chunk, "assistant")
+        self.chat_display.config(state=tk.NORMAL)
+        self.chat_display.insert("response_end", "\n\n", "assistant")
+        self.chat_display.mark_unset("response_end")
+        self.streaming_response = False
+        
+        # Speak the last sentence even if it has no closing punctuation
+        if self.tts_var.get():
+            self.speech_service.finish_speaking()
         
         self.chat_display.see(tk.END)
         self.chat_display.config(state=tk.DISABLED)
     
     def handle_response_chunk(self, text_chunk):
         """Handle a chunk of streaming response"""
-        if text_chunk:
-            # Update the message display immediately
-            self.message_queue.put(("chat", "add_response_chunk", text_chunk))
-            
-            # Use text-to-speech if enabled
-            if self.tts_var.get():
-                self.speech_service.speak_text(text_chunk)
+        # The chat controller sends coalesced display updates itself
+        if text_chunk and self.tts_var.get():
+            # Speech is buffered into sentences, so every chunk is passed on
+            self.speech_service.speak_text(text_chunk)
     
     def add_message(self, sender, message):
         """Add a message to the chat display"""
@@ -501,6 +569,7 @@ class SpecialistChatPanel(ttk.LabelFrame):
         self.user_data = user_data
         self.message_queue = message_queue
         self.specialist_agent = None
+        self.speech_service = None
         
         self.setup_ui()
     
@@ -578,19 +647,16 @@ class SpecialistChatPanel(ttk.LabelFrame):
         # Initialize specialist agent
         self.specialist_agent = SpecialistAgent(specialist, self.user_data)
         
-        # Get initial greeting from specialist
-        threading.Thread(
-            target=self.get_specialist_greeting,
-            daemon=True
-        ).start()
+        # Get initial greeting from specialist on the shared event loop
+        get_event_loop_thread().submit(self.get_specialist_greeting())
     
-    def get_specialist_greeting(self):
+    async def get_specialist_greeting(self):
         """Get initial greeting from the specialist"""
         if not self.specialist_agent:
             return
         
         # Use a generic greeting prompt
-        greeting = self.specialist_agent.get_response(
+        greeting = await self.specialist_agent.get_response_async(
             "Hello, I would like to consult with you about my health concerns."
         )
         
@@ -613,15 +679,17 @@ class SpecialistChatPanel(ttk.LabelFrame):
         # Clear input
         self.message_entry.delete(0, tk.END)
         
-        # Process in background thread
-        threading.Thread(
-            target=self.process_specialist_message,
-            args=(message,),
-            daemon=True
-        ).start()
+        # Process on the shared event loop
+        deadline = Deadline(LLM_RESILIENCE_SETTINGS["interactive_timeout"])
+        get_event_loop_thread().submit(self.process_specialist_message_async(message, deadline))
     
     def process_specialist_message(self, message):
         """Process a message sent to the specialist agent"""
+        deadline = Deadline(LLM_RESILIENCE_SETTINGS["interactive_timeout"])
+        get_event_loop_thread().run(self.process_specialist_message_async(message, deadline))
+    
+    async def process_specialist_message_async(self, message, deadline=None):
+        """Process a message sent to the specialist agent without blocking a thread"""
         if not self.specialist_agent:
             return
         
@@ -629,7 +697,7 @@ class SpecialistChatPanel(ttk.LabelFrame):
         self.message_queue.put(("specialist", "add_message", ("system", "The specialist is typing...")))
         
         # Get response from specialist agent
-        response = self.specialist_agent.get_response(message)
+        response = await self.specialist_agent.get_response_async(message, deadline=deadline)
         
         # Remove "thinking" indicator
         self.message_queue.put(("specialist", "remove_thinking", None))
@@ -643,9 +711,9 @@ class SpecialistChatPanel(ttk.LabelFrame):
             messagebox.showinfo("Specialist", "Please connect to a specialist first")
             return
         
-        # This will be implemented with the speech service
-        from services.speech_service import SpeechService
-        speech_service = SpeechService()
+        # Reuse one speech service across mic presses (the Whisper model is shared)
+        if self.speech_service is None:
+            self.speech_service = SpeechService()
         
         # Add a message to indicate recording
         self.add_message("system", "Listening...")
@@ -653,7 +721,7 @@ class SpecialistChatPanel(ttk.LabelFrame):
         # Start recording in a background thread
         threading.Thread(
             target=self.capture_speech_for_specialist,
-            args=(speech_service,),
+            args=(self.speech_service,),
             daemon=True
         ).start()
     
@@ -1156,9 +1224,11 @@ class PatientView(ttk.Frame):
                     if action == "add_message":
                         self.chat_panel.add_message(data[0], data[1])
                     elif action == "add_response_chunk":
-                        # This would handle streaming responses
                         self.chat_panel.add_response_chunk(data)
-                        pass
+                    elif action == "end_response":
+                        self.chat_panel.end_response()
+                    elif action == "set_input_text":
+                        self.chat_panel.set_input_text(data)
                 
                 elif target == "specialist":
                     if action == "add_message":
@@ -1178,10 +1248,12 @@ class PatientView(ttk.Frame):
         except queue.Empty:
             pass
         finally:
-            # Schedule to run again after 100ms
-            self.after(100, self.process_message_queue)
+            # Poll often enough to show each coalesced streaming update
+            self.after(UI_SETTINGS["message_poll_ms"], self.process_message_queue)
     
     def logout(self):
         """Log out the current user"""
         if messagebox.askyesno("Logout", "Are you sure you want to logout?"):
+            if self.chat_panel.voice_controller:
+                self.chat_panel.voice_controller.stop()
             self.app.show_auth_view()
\ No newline at end of file